@@ -0,0 +1,48 @@
+"""
+Internal helper for mapping many already-fetched TEI documents at once.
+
+Not used by the CLI or Pipeline, which map each paper as it arrives; call it
+from scripts that hold a batch of TEI bytes. The worker count comes from the
+``workers`` argument or PAPERSLICER_PARSE_WORKERS (default: CPU count).
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from paperslicer.grobid.parser import tei_to_record
+from paperslicer.models import PaperRecord
+
+
+def _worker_count() -> int:
+    try:
+        return max(1, int(os.getenv("PAPERSLICER_PARSE_WORKERS", str(os.cpu_count() or 1))))
+    except ValueError:
+        return 1
+
+
+def _parse_one(item: Tuple[bytes, str]) -> PaperRecord:
+    tei_bytes, pdf_path = item
+    return tei_to_record(tei_bytes, pdf_path)
+
+
+def tei_to_records(
+    items: Iterable[Tuple[bytes, str]],
+    workers: Optional[int] = None,
+    chunksize: int = 8,
+) -> List[PaperRecord]:
+    """Map many (tei_bytes, pdf_path) pairs to PaperRecords, in input order.
+
+    TEI mapping is CPU-bound and independent per paper, so batches are spread
+    over a process pool. Each worker imports the parser module once, so the
+    shared XMLParser and compiled XPaths are built once per process rather
+    than per document. chunksize > 1 amortizes the per-task IPC cost.
+    Small batches, or workers=1 (also via PAPERSLICER_PARSE_WORKERS), run
+    inline.
+    """
+    pairs: Sequence[Tuple[bytes, str]] = list(items)
+    n = workers if workers is not None else _worker_count()
+    n = min(n, len(pairs))
+    if n <= 1:
+        return [_parse_one(p) for p in pairs]
+    with ProcessPoolExecutor(max_workers=n) as ex:
+        return list(ex.map(_parse_one, pairs, chunksize=max(1, chunksize)))
@@ -2,6 +2,13 @@ import os
 import pathlib
 from typing import Optional, Tuple
 import requests
+from requests.adapters import HTTPAdapter
+
+# Optional: streams multipart uploads instead of buffering the whole PDF
+try:
+    from requests_toolbelt import MultipartEncoder  # type: ignore
+except Exception:
+    MultipartEncoder = None  # type: ignore
 
 DEFAULT_URL = "http://localhost:8070"
 
@@ -10,16 +17,34 @@ class GrobidClient:
     Minimal HTTP client for GROBID.
     - is_available(): quick health check (returns True/False)
     - process_fulltext(pdf_path): returns TEI XML bytes for a PDF
+    - close(): release pooled connections (also via ``with GrobidClient() as cli``)
+
+    Share one client across a batch so keep-alive connections carry over
+    from one PDF to the next.
     """
     def __init__(self, base_url: Optional[str] = None, timeout: int = 120, autostart: bool = True):
         # Use env var if provided, else default localhost
         self.base_url = (base_url or os.getenv("GROBID_URL") or DEFAULT_URL).rstrip("/")
         self.timeout = timeout
         self.autostart = autostart
+        # Keep-alive session so consecutive requests reuse the TCP connection
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    def close(self) -> None:
+        self._session.close()
+
+    def __enter__(self) -> "GrobidClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
 
     def is_available(self) -> bool:
         try:
-            r = requests.get(self.base_url, timeout=2)
+            r = self._session.get(self.base_url, timeout=2)
             return r.status_code < 500
         except Exception:
             return False
@@ -47,7 +72,6 @@ class GrobidClient:
                 pass
         url = f"{self.base_url}/api/processFulltextDocument"
         with open(pdf_path, "rb") as fh:
-            files = {"input": fh}
             # Allow environment overrides to mitigate 429/JSON parsing in consolidation
             ch = int(os.getenv("GROBID_CONSOLIDATE_HEADER", str(consolidate_header)))
             cc = int(os.getenv("GROBID_CONSOLIDATE_CITATIONS", str(consolidate_citations)))
@@ -62,7 +86,14 @@ class GrobidClient:
             if tei_coordinates:
                 # use full names: figure,table
                 data["teiCoordinates"] = tei_coordinates
-            r = requests.post(url, files=files, data=data, timeout=self.timeout)
+            if MultipartEncoder is not None:
+                fields = dict(data)
+                fields["input"] = (os.path.basename(pdf_path), fh, "application/pdf")
+                m = MultipartEncoder(fields=fields)
+                r = self._session.post(url, data=m, headers={"Content-Type": m.content_type}, timeout=self.timeout)
+            else:
+                files = {"input": fh}
+                r = self._session.post(url, files=files, data=data, timeout=self.timeout)
         r.raise_for_status()
         tei_bytes = r.content
         saved_path: Optional[str] = None
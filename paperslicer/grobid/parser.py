@@ -1,5 +1,6 @@
 from __future__ import annotations
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Pattern, Tuple
 from lxml import etree
 import re
 
@@ -8,6 +9,102 @@ from paperslicer.utils.sections_mapping import canonical_section_name, NON_CONTE
 
 NS = {"tei": "http://www.tei-c.org/ns/1.0"}
 
+# Shared TEI parser: skips the xml:id hash table, whitespace-only text nodes
+# and entity expansion, none of which the mapping below relies on. Network
+# access stays off and recovery stays off so malformed TEI still raises.
+_TEI_PARSER = etree.XMLParser(
+    collect_ids=False,
+    remove_blank_text=True,
+    huge_tree=True,
+    resolve_entities=False,
+    no_network=True,
+    recover=False,
+)
+
+# Header XPaths are compiled once at import; lxml would otherwise re-parse the
+# expression strings for every TEI document. They are evaluated relative to
+# <teiHeader> so the (much larger) body is never scanned for metadata.
+_XP_TITLE = etree.XPath("./tei:fileDesc/tei:titleStmt/tei:title", namespaces=NS)
+_XP_DOI = etree.XPath(".//tei:sourceDesc//tei:biblStruct//tei:idno[@type='DOI']", namespaces=NS)
+_XP_JOURNAL = etree.XPath(".//tei:sourceDesc//tei:biblStruct/tei:monogr/tei:title", namespaces=NS)
+_XP_AUTHORS = etree.XPath(".//tei:sourceDesc//tei:biblStruct/tei:analytic/tei:author", namespaces=NS)
+_XP_ABSTRACT = etree.XPath("./tei:profileDesc/tei:abstract", namespaces=NS)
+_XP_KEYWORDS = etree.XPath(".//tei:profileDesc//tei:textClass//tei:keywords//tei:term", namespaces=NS)
+
+_XP_PRECEDING_PB = etree.XPath("preceding::tei:pb[1]", namespaces=NS)  # standalone fallback
+
+# Back-matter references, relative to <text>; the author step runs once per biblStruct.
+_XP_REF_BIBLS = etree.XPath("./tei:back//tei:listBibl/tei:biblStruct", namespaces=NS)
+_XP_REF_AUTHORS = etree.XPath("./tei:analytic/tei:author", namespaces=NS)
+
+# Affiliation XPaths; these run once per author.
+_XP_ORGNAME = etree.XPath(".//tei:orgName", namespaces=NS)
+_XP_ADDRESS_PARTS = etree.XPath(".//tei:address//*[not(self::tei:label)]", namespaces=NS)
+
+# Clark-notation tags for find()/iter() lookups and tag comparisons; no prefix
+# resolution against NS is needed per call.
+_TEI = f"{{{NS['tei']}}}"
+_TAG_TEI_HEADER = f"{_TEI}teiHeader"
+_TAG_TEXT = f"{_TEI}text"
+_TAG_BODY = f"{_TEI}body"
+_TAG_DIV = f"{_TEI}div"
+_TAG_HEAD = f"{_TEI}head"
+_TAG_P = f"{_TEI}p"
+_TAG_AB = f"{_TEI}ab"
+_TAG_REF = f"{_TEI}ref"
+_TAG_PB = f"{_TEI}pb"
+_TAG_LABEL = f"{_TEI}label"
+_TAG_FIGURE = f"{_TEI}figure"
+_TAG_TABLE = f"{_TEI}table"
+_TAG_FIGDESC = f"{_TEI}figDesc"
+_TAG_ZONE = f"{_TEI}zone"
+_TAG_SURFACE = f"{_TEI}surface"
+_TAG_GRAPHIC = f"{_TEI}graphic"
+_TAG_PERSNAME = f"{_TEI}persName"
+_TAG_AFFILIATION = f"{_TEI}affiliation"
+_TAG_HEAD_LABEL = f"{_TAG_HEAD}/{_TAG_LABEL}"
+_TAG_PERS_SURNAME = f"{_TAG_PERSNAME}/{_TEI}surname"
+_TAG_PERS_FORENAME = f"{_TAG_PERSNAME}/{_TEI}forename"
+# ElementPath lookups for reference entries (simple steps; no XPath engine)
+_PATH_REF_TITLE = f"{_TEI}analytic/{_TEI}title[@type='main']"
+_PATH_REF_MONOGR_TITLE = f"{_TEI}monogr/{_TEI}title"
+_PATH_REF_DOI = f".//{_TEI}idno[@type='DOI']"
+_PATH_REF_YEAR = f".//{_TEI}date[@type='published']"
+_XML_ID = "{http://www.w3.org/XML/1998/namespace}id"
+
+# Canonical keys never kept as body sections, and key prefixes of figure/table
+# heads that GROBID sometimes emits as body divs.
+_SKIP_SECTION_KEYS = frozenset(NON_CONTENT_KEYS | {"references", "bibliography"})
+_SKIP_SECTION_PREFIXES = ("fig.", "table")
+# Keys kept in `sections`; other heads go to `other_sections` verbatim.
+_CANONICAL_SECTION_KEYS = frozenset({
+    "abstract", "introduction", "materials_and_methods", "results",
+    "discussion", "conclusions", "results_and_discussion",
+})
+
+# Table-caption fallback: "Table 2. ..." paragraphs, and per-number patterns
+# for <ref type="table"> (cached; the same few numbers recur across a paper).
+_RE_TABLE_PARA = re.compile(r"^table\s+([A-Za-z0-9IVXLC]+)\s*[:\.\-]\s*(.+)", re.IGNORECASE | re.DOTALL)
+
+
+@lru_cache(maxsize=64)
+def _table_ref_patterns(num: str) -> Tuple[Pattern[str], Pattern[str]]:
+    esc = re.escape(num)
+    return (
+        re.compile(r"\btable\s*" + esc + r"\s*[:\.\-]\s*(.+)", re.IGNORECASE),
+        re.compile(r"\btable\s*" + esc + r"\b", re.IGNORECASE),
+    )
+
+
+# Label numbers in figure/table heads or captions ("Figure 1 .", "Table 3."),
+# a bare small-integer TEI label, and the coords separators.
+_RE_LABEL_BY_KIND = {
+    "figure": re.compile(r"\bfig(?:ure)?\s*([A-Za-z0-9IVXLC]+)", re.IGNORECASE),
+    "table": re.compile(r"\btab(?:le)?\s*([A-Za-z0-9IVXLC]+)", re.IGNORECASE),
+}
+_RE_SMALL_INT = re.compile(r"\d{1,3}")
+_RE_COORDS_SPLIT = re.compile(r"[;,\s]+")
+
 
 def _normalize_space(text: str) -> str:
     return " ".join(text.split())
@@ -16,7 +113,25 @@ def _normalize_space(text: str) -> str:
 def _txt(el: Optional[etree._Element]) -> str:
     if el is None:
         return ""
-    return _normalize_space(" ".join(el.itertext()))
+    if len(el) == 0:
+        # Leaf nodes (titles, idno, terms, labels): skip the itertext generator
+        return _normalize_space(el.text or "")
+    # Split each text node as it streams out of itertext(); joining the pieces
+    # with spaces first and re-splitting would build the full string twice.
+    parts: List[str] = []
+    for chunk in el.itertext():
+        parts.extend(chunk.split())
+    return " ".join(parts)
+
+
+def _starts_with_word(el: etree._Element, word: str) -> bool:
+    """Cheap prefilter: does the element's first non-blank text start with *word*
+    (case-insensitive)? Avoids normalizing the full text of every paragraph."""
+    for chunk in el.itertext():
+        chunk = chunk.lstrip()
+        if chunk:
+            return chunk[: len(word)].lower() == word
+    return False
 
 
 def _clean_author_name(name: Optional[str]) -> Optional[str]:
@@ -29,12 +144,8 @@ def _clean_author_name(name: Optional[str]) -> Optional[str]:
 
 
 def _extract_affiliation(author_el: etree._Element) -> Optional[str]:
-    aff_nodes = _all(author_el, "./tei:affiliation")
-    if not aff_nodes:
-        return None
-
     aff_texts: List[str] = []
-    for aff in aff_nodes:
+    for aff in author_el.iterchildren(_TAG_AFFILIATION):
         parts: List[str] = []
         seen_local = set()
 
@@ -50,9 +161,9 @@ def _extract_affiliation(author_el: etree._Element) -> Optional[str]:
             seen_local.add(key)
             parts.append(norm)
 
-        for org in aff.xpath(".//tei:orgName", namespaces=NS):
+        for org in _XP_ORGNAME(aff):
             add_part(_txt(org))
-        for addr_part in aff.xpath(".//tei:address//*[not(self::tei:label)]", namespaces=NS):
+        for addr_part in _XP_ADDRESS_PARTS(aff):
             add_part(_txt(addr_part))
 
         if not parts:
@@ -61,35 +172,31 @@ def _extract_affiliation(author_el: etree._Element) -> Optional[str]:
         if parts:
             aff_texts.append(", ".join(parts))
 
-    unique_affs: List[str] = []
-    seen = set()
+    # Case-insensitive de-dup; first spelling wins
+    unique_affs: Dict[str, str] = {}
     for text in aff_texts:
-        key = text.lower()
-        if key in seen:
-            continue
-        seen.add(key)
-        unique_affs.append(text)
+        unique_affs.setdefault(text.lower(), text)
 
     if not unique_affs:
         return None
 
-    return "; ".join(unique_affs)
+    return "; ".join(unique_affs.values())
 
 
-def _first(root: etree._Element, xpath: str) -> Optional[etree._Element]:
-    res = root.xpath(xpath, namespaces=NS)
-    return res[0] if res else None
+def _eval(root: Optional[etree._Element], xpath: etree.XPath) -> List[etree._Element]:
+    if root is None:
+        return []
+    return xpath(root)
 
 
-def _all(root: etree._Element, xpath: str) -> List[etree._Element]:
-    return list(root.xpath(xpath, namespaces=NS))
-
-
-NON_CONTENT_KEYS = NON_CONTENT_KEYS
+def _first(root: Optional[etree._Element], xpath: etree.XPath) -> Optional[etree._Element]:
+    res = _eval(root, xpath)
+    return res[0] if res else None
 
 
-def _canonical_section_name(name: str) -> str:
-    return canonical_section_name(name)
+def _all(root: Optional[etree._Element], xpath: etree.XPath) -> List[etree._Element]:
+    # lxml already returns a fresh list for node-set results; no copy needed.
+    return _eval(root, xpath)
 
 
 def _normalize_label(kind: str, raw_label: Optional[str], head_text: str, caption_text: str) -> Optional[str]:
@@ -102,14 +209,10 @@ def _normalize_label(kind: str, raw_label: Optional[str], head_text: str, captio
     # 1) Try to parse from head_text (e.g., "Figure 1 .", "Table 3.")
     head = (head_text or "").strip()
     cap = (caption_text or "").strip()
-    patterns = []
-    if kind_lc == "figure":
-        patterns = [r"(?i)\bfig(?:ure)?\s*([A-Za-z0-9IVXLC]+)"]
-    elif kind_lc == "table":
-        patterns = [r"(?i)\btab(?:le)?\s*([A-Za-z0-9IVXLC]+)"]
-    for s in (head, cap):
-        for pat in patterns:
-            m = re.search(pat, s)
+    pat = _RE_LABEL_BY_KIND.get(kind_lc)
+    if pat is not None:
+        for s in (head, cap):
+            m = pat.search(s)
             if m:
                 num = m.group(1).strip().rstrip(".:)")
                 return f"{kind_lc.capitalize()} {num}"
@@ -117,7 +220,7 @@ def _normalize_label(kind: str, raw_label: Optional[str], head_text: str, captio
     rl = (raw_label or "").strip()
     # If TEI label is something like "51" but head/caption contained a match above, we'd have returned already.
     # Accept a simple integer token
-    m2 = re.fullmatch(r"\d{1,3}", rl)
+    m2 = _RE_SMALL_INT.fullmatch(rl)
     if m2:
         return f"{kind_lc.capitalize()} {rl}"
     # 3) Last resort: use head/caption without number
@@ -128,22 +231,32 @@ def _normalize_label(kind: str, raw_label: Optional[str], head_text: str, captio
     return None
 
 
-def _nearest_page_number(el: etree._Element) -> Optional[int]:
+def _nearest_page_number(
+    el: etree._Element, page_of: Optional[Dict[etree._Element, Optional[str]]] = None
+) -> Optional[int]:
     """Best-effort page number for an element using nearest preceding tei:pb/@n.
+    page_of, when given, maps elements to the @n of the last <pb> seen before
+    them during the body walk, avoiding a reverse-axis XPath per element.
     Falls back to None if not found or unparsable.
     """
     try:
-        pb = el.xpath("preceding::tei:pb[1]", namespaces=NS)
-        if pb:
-            n = pb[0].get("n")
-            if n and str(n).strip().isdigit():
-                return int(str(n).strip())
+        if page_of is not None:
+            n = page_of.get(el)
+        else:
+            pb = _XP_PRECEDING_PB(el)
+            n = pb[0].get("n") if pb else None
+        if n and str(n).strip().isdigit():
+            return int(str(n).strip())
     except Exception:
         pass
     return None
 
 
-def _coords_with_page(el: etree._Element, coords: Optional[str]) -> Optional[str]:
+def _coords_with_page(
+    el: etree._Element,
+    coords: Optional[str],
+    page_of: Optional[Dict[etree._Element, Optional[str]]] = None,
+) -> Optional[str]:
     """Normalize coords to "page,x,y,w,h" if possible.
     If coords already contains 5 numbers, return as-is. If 4 numbers, prefix the
     nearest page number if available.
@@ -151,7 +264,7 @@ def _coords_with_page(el: etree._Element, coords: Optional[str]) -> Optional[str
     if not coords:
         return None
     # extract numbers from coords (space/comma/semicolon separated)
-    parts = re.split(r"[;,\s]+", coords.strip())
+    parts = _RE_COORDS_SPLIT.split(coords.strip())
     nums: List[float] = []
     for p in parts:
         if not p:
@@ -159,21 +272,58 @@ def _coords_with_page(el: etree._Element, coords: Optional[str]) -> Optional[str
         try:
             nums.append(float(p))
         except Exception:
-            pass
+            continue
+        # only the first box (page,x,y,w,h) is used
+        if len(nums) == 5:
+            break
     if len(nums) >= 5:
         # assume already includes page
-        return ",".join(str(int(nums[0] if i == 0 else nums[i])) if i == 0 else (str(nums[i])) for i in range(5))
+        return f"{int(nums[0])},{nums[1]},{nums[2]},{nums[3]},{nums[4]}"
     if len(nums) >= 4:
-        page = _nearest_page_number(el)
+        page = _nearest_page_number(el, page_of)
         if page is not None:
             x, y, w, h = nums[:4]
             return f"{page},{x},{y},{w},{h}"
     return None
 
 
-def _coords_from_facs(root: etree._Element, el: etree._Element) -> Optional[str]:
+def _is_new(seen: set, key: str) -> bool:
+    """Add key to seen; True if it was not there (one hash probe, not two)."""
+    n = len(seen)
+    seen.add(key)
+    return len(seen) != n
+
+
+def _node_coords(
+    el: etree._Element,
+    zones: Dict[str, etree._Element],
+    page_of: Dict[etree._Element, Optional[str]],
+) -> Optional[str]:
+    """Coords for a figure/table: graphic/@coords first, then its facsimile zone."""
+    coords = None
+    # First descendant <graphic> (GROBID nests it directly or one level down)
+    g = next(el.iter(_TAG_GRAPHIC), None)
+    if g is not None:
+        coords = _coords_with_page(el, g.get("coords"), page_of)
+    if not coords:
+        coords = _coords_from_facs(zones, el)
+    return coords
+
+
+def _build_zone_index(root: etree._Element) -> Dict[str, etree._Element]:
+    """Map facsimile zone xml:id -> zone element (first occurrence wins)."""
+    zones: Dict[str, etree._Element] = {}
+    for z in root.iter(_TAG_ZONE):
+        zid = z.get(_XML_ID)
+        if zid:
+            zones.setdefault(zid, z)
+    return zones
+
+
+def _coords_from_facs(zones: Dict[str, etree._Element], el: etree._Element) -> Optional[str]:
     """
     Resolve coordinates via facsimile/zone when element carries @facs="#zoneId".
+    `zones` is the per-document index from _build_zone_index.
     Returns "page,x,y,w,h" string when resolvable.
     """
     try:
@@ -183,13 +333,13 @@ def _coords_from_facs(root: etree._Element, el: etree._Element) -> Optional[str]
             facs = el.attrib.get("{http://www.w3.org/2000/xmlns/}facs")
         if not facs or not facs.startswith("#"):
             return None
-        zone_id = facs[1:]
-        z = root.xpath(f"//tei:zone[@xml:id='{zone_id}']", namespaces=NS)
-        if not z:
+        # @facs may list several zones ("#z1 #z2"); resolve the first one
+        space = facs.find(" ")
+        zone = zones.get(facs[1:space] if space >= 0 else facs[1:])
+        if zone is None:
             return None
-        zone = z[0]
         surface = zone.getparent()
-        if surface is None or not surface.tag.endswith("surface"):
+        if surface is None or surface.tag != _TAG_SURFACE:
             return None
         page_n = surface.get("n")
         try:
@@ -215,27 +365,64 @@ def tei_to_record(tei_bytes: bytes, pdf_path: str) -> PaperRecord:
 
     Conservative and simple: extract meta, a few canonical sections, and basic figure/table captions.
     """
-    root = etree.fromstring(tei_bytes)
+    root = etree.fromstring(tei_bytes, _TEI_PARSER)
+
+    # Locate the fixed top-level TEI structure once; queries below are
+    # relative to these subtrees instead of //-scanning the whole document.
+    header = root.find(_TAG_TEI_HEADER)
+    text_el = root.find(_TAG_TEXT)
+    body = text_el.find(_TAG_BODY) if text_el is not None else None
+
+    # One document-order walk over <text> buckets every node kind the passes
+    # below consume (body divs, figures, tables, table refs, paragraphs)
+    # instead of re-descending the subtree once per XPath. Page breaks passed
+    # on the way give each figure/table its nearest preceding <pb>.
+    body_divs: List[etree._Element] = []
+    fig_nodes: List[etree._Element] = []
+    tab_nodes: List[etree._Element] = []
+    table_refs: List[etree._Element] = []
+    paras: List[etree._Element] = []
+    page_of: Dict[etree._Element, Optional[str]] = {}
+    last_pb: Optional[str] = None
+    if text_el is not None:
+        for part in text_el:
+            in_body = part is body
+            for el in part.iter(_TAG_DIV, _TAG_FIGURE, _TAG_TABLE, _TAG_REF, _TAG_P, _TAG_PB):
+                tag = el.tag
+                if tag == _TAG_P:
+                    paras.append(el)
+                elif tag == _TAG_REF:
+                    if el.get("type") == "table":
+                        table_refs.append(el)
+                elif tag == _TAG_DIV:
+                    if in_body:
+                        body_divs.append(el)
+                elif tag == _TAG_PB:
+                    last_pb = el.get("n")
+                elif tag == _TAG_FIGURE:
+                    fig_nodes.append(el)
+                    page_of[el] = last_pb
+                else:
+                    tab_nodes.append(el)
+                    page_of[el] = last_pb
 
     # ---- Meta
-    title_el = _first(root, "//tei:teiHeader//tei:titleStmt/tei:title")
+    title_el = _first(header, _XP_TITLE)
     title = _txt(title_el)
 
-    doi_el = _first(root, "//tei:teiHeader//tei:sourceDesc//tei:biblStruct//tei:idno[@type='DOI']")
+    doi_el = _first(header, _XP_DOI)
     doi = _txt(doi_el)
 
-    journal_el = _first(root, "//tei:teiHeader//tei:sourceDesc//tei:biblStruct/tei:monogr/tei:title")
+    journal_el = _first(header, _XP_JOURNAL)
     journal = _txt(journal_el)
 
     authors: List[Dict[str, Optional[str]]] = []
-    for a in _all(root, "//tei:teiHeader//tei:sourceDesc//tei:biblStruct/tei:analytic/tei:author"):
-        name = _txt(_first(a, "./tei:persName")) or (
-            _txt(_first(a, "./tei:persName/tei:surname"))
-            + ", "
-            + _txt(_first(a, "./tei:persName/tei:forename"))
-            if _first(a, "./tei:persName/tei:surname") is not None
-            else ""
-        )
+    for a in _all(header, _XP_AUTHORS):
+        name = _txt(a.find(_TAG_PERSNAME))
+        if not name:
+            # Rare: empty persName text; fall back to "Surname, Forename"
+            sur = a.find(_TAG_PERS_SURNAME)
+            name = f"{_txt(sur)}, {_txt(a.find(_TAG_PERS_FORENAME))}" if sur is not None else ""
         name = _clean_author_name(name)
         aff = _extract_affiliation(a)
         if not name and not aff:
@@ -245,66 +432,54 @@ def tei_to_record(tei_bytes: bytes, pdf_path: str) -> PaperRecord:
     meta = Meta(source_path=pdf_path, title=title or None, journal=journal or None, doi=doi or None, authors=authors)
 
     # ---- Sections (by body div/head)
-    sections: Dict[str, str] = {}
-    other_sections: Dict[str, str] = {}
-    for div in _all(root, "//tei:text/tei:body//tei:div"):
-        head = _txt(_first(div, "./tei:head"))
+    # Repeated heads collect their chunks in lists, joined once after the loop.
+    section_parts: Dict[str, List[str]] = {}
+    other_parts: Dict[str, List[str]] = {}
+    for div in body_divs:
+        head = _txt(div.find(_TAG_HEAD))
         if not head:
             continue
-        key = _canonical_section_name(head)
-        # Exclude references and known non-content heads from body sections
-        if key in {"references", "bibliography"} or key in NON_CONTENT_KEYS:
-            continue
-        # Skip figure/table heads that sometimes appear as body sections
-        if key.startswith("fig.") or key.startswith("table"):
+        key = canonical_section_name(head)
+        # Exclude references, known non-content heads and figure/table heads
+        if key in _SKIP_SECTION_KEYS or key.startswith(_SKIP_SECTION_PREFIXES):
             continue
 
-        content_texts: List[str] = []
-        # Prefer paragraph-like nodes to avoid pulling in nested heads/captions
-        for node in div.xpath(".//tei:p|.//tei:ab", namespaces=NS):
-            t = _txt(node)
-            if t:
-                content_texts.append(t)
-        body_text = "\n\n".join(content_texts)
-        body_text = " ".join(body_text.split())
+        # Prefer paragraph-like nodes to avoid pulling in nested heads/captions.
+        # Paragraph breaks collapse to single spaces in the final text anyway,
+        # so tokens are gathered straight from itertext() and joined once.
+        tokens: List[str] = []
+        for node in div.iter(_TAG_P, _TAG_AB):
+            for chunk in node.itertext():
+                tokens.extend(chunk.split())
+        body_text = " ".join(tokens)
         if body_text:
-            # Append if key repeats
-            canonical_keys = {"abstract", "introduction", "materials_and_methods", "results", "discussion", "conclusions", "results_and_discussion"}
-            if key in canonical_keys:
-                if key in sections:
-                    sections[key] += "\n\n" + body_text
-                else:
-                    sections[key] = body_text
+            if key in _CANONICAL_SECTION_KEYS:
+                section_parts.setdefault(key, []).append(body_text)
             else:
                 # Unmapped but potentially relevant heading: keep under other_sections using original head text
-                if head in other_sections:
-                    other_sections[head] += "\n\n" + body_text
-                else:
-                    other_sections[head] = body_text
+                other_parts.setdefault(head, []).append(body_text)
+    sections: Dict[str, str] = {k: "\n\n".join(v) for k, v in section_parts.items()}
+    other_sections: Dict[str, str] = {k: "\n\n".join(v) for k, v in other_parts.items()}
 
     # ---- Abstract (often under teiHeader/profileDesc/abstract)
-    abs_el = _first(root, "//tei:teiHeader//tei:profileDesc/tei:abstract")
+    abs_el = _first(header, _XP_ABSTRACT)
     if abs_el is not None:
         abs_txt = _txt(abs_el)
         if abs_txt:
             sections.setdefault("abstract", abs_txt)
 
     keywords: List[str] = []
-    for term in _all(root, "//tei:teiHeader//tei:profileDesc//tei:textClass//tei:keywords//tei:term"):
+    for term in _all(header, _XP_KEYWORDS):
         kw = _txt(term)
         if kw:
             keywords.append(kw)
     if keywords:
-        uniq = []
-        seen_kw = set()
+        uniq: Dict[str, str] = {}
         for kw in keywords:
             norm_kw = _normalize_space(kw)
-            key = norm_kw.lower()
-            if not norm_kw or key in seen_kw:
-                continue
-            seen_kw.add(key)
-            uniq.append(norm_kw)
-        keywords = uniq
+            if norm_kw:
+                uniq.setdefault(norm_kw.lower(), norm_kw)
+        keywords = list(uniq.values())
     if keywords:
         meta.keywords = keywords
         kw_text = ", ".join(keywords).strip()
@@ -320,139 +495,126 @@ def tei_to_record(tei_bytes: bytes, pdf_path: str) -> PaperRecord:
     tables: List[Dict[str, Any]] = []
     fig_labels_seen = set()
     tab_labels_seen = set()
+    # Labels of emitted tables, kept up to date as tables are appended so the
+    # text fallback below never has to rescan the list.
+    table_labels = set()
+
+    # Figures are processed before tables so de-duplication precedence is
+    # unchanged. The byte probe (prefix-agnostic) skips the zone index when it
+    # cannot match: most GROBID output carries @coords rather than facsimile zones.
+    zones = _build_zone_index(root) if b"facs" in tei_bytes else {}
 
-    for fig in _all(root, "//tei:text//tei:figure"):
+    for fig in fig_nodes:
         ftype = (fig.get("type") or "").strip().lower()
-        label_raw = _txt(_first(fig, "./tei:label"))
-        head_text = _txt(_first(fig, "./tei:head"))
-        caption_text = _txt(_first(fig, "./tei:figDesc")) or head_text
-        coords = None
-        g = _first(fig, ".//tei:graphic")
-        if g is not None:
-            coords = _coords_with_page(fig, g.get("coords"))
-        if not coords:
-            coords = _coords_from_facs(root, fig)
+        label_raw = _txt(fig.find(_TAG_LABEL))
+        head_text = _txt(fig.find(_TAG_HEAD))
+        caption_text = _txt(fig.find(_TAG_FIGDESC)) or head_text
 
         if ftype == "table":
             label = _normalize_label("table", label_raw, head_text, caption_text)
-            if (caption_text or label):
-                key = label or caption_text or ""
-                if key not in tab_labels_seen:
-                    tables.append({
-                        "label": label or None,
-                        "caption": caption_text or None,
-                        "path": None,
-                        "source": "tei",
-                        "coords": coords,
-                    })
-                    tab_labels_seen.add(key)
-            continue
-
-        # default: treat as figure
-        label = _normalize_label("figure", label_raw, head_text, caption_text)
-        if (caption_text or label):
-            key = label or caption_text or ""
-            if key not in fig_labels_seen:
-                figures.append({
-                    "label": label or None,
-                    "caption": caption_text or None,
-                    "path": None,
-                    "source": "tei",
-                    "coords": coords,
-                })
-                fig_labels_seen.add(key)
-    for tab in _all(root, "//tei:text//tei:table"):
-        # GROBID table may have head/caption as preceding sibling div, but we try head inside table
-        label_raw = _txt(_first(tab, "./tei:head/tei:label")) or None
-        head_text = _txt(_first(tab, "./tei:head"))
-        caption = head_text
-        label = _normalize_label("table", label_raw, head_text, caption)
-        coords = None
-        g = _first(tab, ".//tei:graphic")
-        if g is not None:
-            coords = _coords_with_page(tab, g.get("coords"))
-        if not coords:
-            coords = _coords_from_facs(root, tab)
-        if caption or label:
-            key = label or caption or ""
-            if key not in tab_labels_seen:
+            if (caption_text or label) and _is_new(tab_labels_seen, label or caption_text or ""):
                 tables.append({
                     "label": label or None,
-                    "caption": caption or None,
+                    "caption": caption_text or None,
                     "path": None,
                     "source": "tei",
-                    "coords": coords,
+                    "coords": _node_coords(fig, zones, page_of),
                 })
-                tab_labels_seen.add(key)
+                if label:
+                    table_labels.add(label)
+            continue
 
-    # Fallback: Some journals don't emit <table>; use textual cues and <ref type="table">
-    try:
-        import re
-        existing_labels = {t.get("label") for t in tables if t.get("label")}
-        # A) refs like: Table <ref type="table">1</ref>
-        for ref in _all(root, "//tei:text//tei:ref[@type='table']"):
-            num = _txt(ref)
-            if not num:
-                continue
-            label = f"Table {num}"
-            if label in existing_labels:
-                continue
-            # find ancestor paragraph
-            par = ref.getparent()
-            while par is not None and par.tag != "{http://www.tei-c.org/ns/1.0}p":
-                par = par.getparent()
-            caption = None
-            if par is not None:
-                ptxt = _txt(par)
-                # strip the label text if present at start
-                m = re.search(r"(?i)\btable\s*" + re.escape(num) + r"\s*[:\.\-]\s*(.+)", ptxt)
-                if m:
-                    caption = m.group(1).strip()
-                else:
-                    # otherwise, use paragraph text without the-word 'Table <num>'
-                    caption = re.sub(r"(?i)\btable\s*" + re.escape(num) + r"\b", "", ptxt).strip()
-            tables.append({
-                "label": label,
-                "caption": caption or None,
+        # default: treat as figure
+        label = _normalize_label("figure", label_raw, head_text, caption_text)
+        if (caption_text or label) and _is_new(fig_labels_seen, label or caption_text or ""):
+            figures.append({
+                "label": label or None,
+                "caption": caption_text or None,
                 "path": None,
-                "source": "tei-ref",
+                "source": "tei",
+                "coords": _node_coords(fig, zones, page_of),
             })
-            existing_labels.add(label)
-
-        # B) paragraphs starting with "Table 2. ..."
-        for p in _all(root, "//tei:text//tei:p"):
-            t = _txt(p)
-            if not t:
-                continue
-            m = re.match(r"(?is)^table\s+([A-Za-z0-9IVXLC]+)\s*[:\.\-]\s*(.+)", t.strip())
-            if not m:
-                continue
-            num = m.group(1)
-            label = f"Table {num}"
-            if label in existing_labels:
-                continue
-            caption = m.group(2).strip()
+    for tab in tab_nodes:
+        # GROBID table may have head/caption as preceding sibling div, but we try head inside table
+        label_raw = _txt(tab.find(_TAG_HEAD_LABEL)) or None
+        head_text = _txt(tab.find(_TAG_HEAD))
+        caption = head_text
+        label = _normalize_label("table", label_raw, head_text, caption)
+        if (caption or label) and _is_new(tab_labels_seen, label or caption or ""):
             tables.append({
-                "label": label,
+                "label": label or None,
                 "caption": caption or None,
                 "path": None,
-                "source": "tei-text",
+                "source": "tei",
+                "coords": _node_coords(tab, zones, page_of),
             })
-            existing_labels.add(label)
-    except Exception:
-        pass
+            if label:
+                table_labels.add(label)
+
+    # Fallback: Some journals don't emit <table>; use textual cues and <ref type="table">
+    par_texts: Dict[etree._Element, str] = {}
+    # A) refs like: Table <ref type="table">1</ref>
+    for ref in table_refs:
+        num = _txt(ref)
+        if not num:
+            continue
+        label = f"Table {num}"
+        if label in table_labels:
+            continue
+        # find ancestor paragraph; several refs often share one
+        par = next(ref.iterancestors(_TAG_P), None)
+        caption = None
+        if par is not None:
+            ptxt = par_texts.get(par)
+            if ptxt is None:
+                ptxt = par_texts[par] = _txt(par)
+            caption_re, label_re = _table_ref_patterns(num)
+            # strip the label text if present at start
+            m = caption_re.search(ptxt)
+            if m:
+                caption = m.group(1).strip()
+            else:
+                # otherwise, use paragraph text without the-word 'Table <num>'
+                caption = label_re.sub("", ptxt).strip()
+        tables.append({
+            "label": label,
+            "caption": caption or None,
+            "path": None,
+            "source": "tei-ref",
+        })
+        table_labels.add(label)
+
+    # B) paragraphs starting with "Table 2. ..."
+    for p in paras:
+        if not _starts_with_word(p, "table"):
+            continue
+        t = _txt(p)
+        if not t:
+            continue
+        m = _RE_TABLE_PARA.match(t.strip())
+        if not m:
+            continue
+        num = m.group(1)
+        label = f"Table {num}"
+        if label in table_labels:
+            continue
+        caption = m.group(2).strip()
+        tables.append({
+            "label": label,
+            "caption": caption or None,
+            "path": None,
+            "source": "tei-text",
+        })
+        table_labels.add(label)
 
     references: List[Dict[str, Any]] = []
-    XML_NS = "{http://www.w3.org/XML/1998/namespace}"
-    for idx, bibl in enumerate(_all(root, "//tei:text/tei:back//tei:listBibl/tei:biblStruct"), start=1):
-        ref_id = bibl.get(f"{XML_NS}id")
-        title = _txt(_first(bibl, "./tei:analytic/tei:title[@type='main']")) or _txt(
-            _first(bibl, "./tei:monogr/tei:title")
-        )
-        doi = _txt(_first(bibl, ".//tei:idno[@type='DOI']"))
-        year = _txt(_first(bibl, ".//tei:date[@type='published']"))
+    for idx, bibl in enumerate(_all(text_el, _XP_REF_BIBLS), start=1):
+        ref_id = bibl.get(_XML_ID)
+        title = _txt(bibl.find(_PATH_REF_TITLE)) or _txt(bibl.find(_PATH_REF_MONOGR_TITLE))
+        doi = _txt(bibl.find(_PATH_REF_DOI))
+        year = _txt(bibl.find(_PATH_REF_YEAR))
         authors = []
-        for auth in _all(bibl, "./tei:analytic/tei:author"):
+        for auth in _XP_REF_AUTHORS(bibl):
             name = _txt(auth)
             if name:
                 authors.append(name)
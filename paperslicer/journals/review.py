@@ -5,17 +5,20 @@ from paperslicer.utils.sections_mapping import canonical_section_name
 
 
 CORE = {"abstract", "introduction", "materials_and_methods", "results", "discussion", "conclusions", "results_and_discussion"}
+_REVIEW_TITLE_HINTS = ("review", "systematic", "meta-analysis")
+_REVIEW_JOURNAL_HINTS = ("periodontology 2000",)
+_REVIEW_SECTION_HINTS = ("search strategy", "study selection", "data extraction", "risk of bias", "quality assessment")
 
 
 def should_apply(rec: PaperRecord) -> bool:
     t = (rec.meta.title or "").lower()
     j = (rec.meta.journal or "").lower()
     # Heuristics: review in title, or certain journals, or typical review sections in other_sections
-    if "review" in t or "systematic" in t or "meta-analysis" in t or "periodontology 2000" in j:
+    if any(k in t for k in _REVIEW_TITLE_HINTS) or any(k in j for k in _REVIEW_JOURNAL_HINTS):
         return True
     if rec.other_sections:
         heads = " ".join(h.lower() for h in rec.other_sections.keys())
-        if any(k in heads for k in ["search strategy", "study selection", "data extraction", "risk of bias", "quality assessment"]):
+        if any(k in heads for k in _REVIEW_SECTION_HINTS):
             return True
     return False
 
@@ -27,14 +30,15 @@ def apply(rec: PaperRecord) -> PaperRecord:
     - If discussion is weak/missing, aggregate other sections into discussion as a fallback
     - Keep original other_sections (do not delete), but enrich canonical ones
     """
-    # 1) Map method-like others into methods
-    for head, text in list(rec.other_sections.items()):
-        key = canonical_section_name(head)
-        if key == "materials_and_methods":
-            if "materials_and_methods" in rec.sections:
-                rec.sections["materials_and_methods"] += "\n\n" + text
-            else:
-                rec.sections["materials_and_methods"] = text
+    # Classify each other-section head once; both passes below reuse it.
+    keys = {head: canonical_section_name(head) for head in rec.other_sections}
+
+    # 1) Map method-like others into methods (collected, then joined once)
+    method_parts = [text for head, text in rec.other_sections.items() if keys[head] == "materials_and_methods"]
+    if method_parts:
+        if "materials_and_methods" in rec.sections:
+            method_parts.insert(0, rec.sections["materials_and_methods"])
+        rec.sections["materials_and_methods"] = "\n\n".join(method_parts)
 
     # 2) If discussion absent or too short, aggregate remaining others into discussion
     disc = rec.sections.get("discussion") or ""
@@ -42,14 +46,12 @@ def apply(rec: PaperRecord) -> PaperRecord:
         agg = []
         for head, text in rec.other_sections.items():
             # Skip items we mapped to methods above
-            if canonical_section_name(head) == "materials_and_methods":
+            if keys[head] == "materials_and_methods":
                 continue
             agg.append(f"{head}\n{text}")
         if agg:
-            payload = "\n\n".join(agg)
             if disc:
-                rec.sections["discussion"] = disc + "\n\n" + payload
-            else:
-                rec.sections["discussion"] = payload
+                agg.insert(0, disc)
+            rec.sections["discussion"] = "\n\n".join(agg)
     return rec
 
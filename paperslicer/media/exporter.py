@@ -1,13 +1,19 @@
 from __future__ import annotations
 import os
+import re
+import json
 import hashlib
-from typing import List, Dict, Any, Optional
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Set, Tuple
 
 
+@lru_cache(maxsize=1024)
 def _safe_stem(path: str) -> str:
     base = os.path.splitext(os.path.basename(path))[0]
     # include a short hash to avoid collisions
-    h = hashlib.sha1(path.encode("utf-8")).hexdigest()[:8]
+    h = hashlib.blake2b(path.encode("utf-8"), digest_size=4).hexdigest()
     return f"{base}_{h}"
 
 
@@ -15,7 +21,160 @@ def _ensure_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
 
-def export_embedded_images(pdf_path: str, media_root: Optional[str] = None, max_images: int = 50) -> List[Dict[str, Any]]:
+def _export_cache_key(pdf_path: str, **params: Any) -> Optional[Dict[str, Any]]:
+    """Identity of an export run: source PDF size/mtime plus exporter params."""
+    try:
+        st = os.stat(pdf_path)
+    except OSError:
+        return None
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "params": params}
+
+
+def _load_cached_export(out_dir: str, kind: str, key: Optional[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+    """Return a previous run's results if its manifest matches and every file still exists."""
+    if key is None:
+        return None
+    try:
+        with open(os.path.join(out_dir, f".{kind}.manifest.json"), "r", encoding="utf-8") as fh:
+            manifest = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("key") != key:
+        return None
+    results = manifest.get("results") or []
+    if not results or not all(os.path.isfile(r.get("path") or "") for r in results):
+        return None
+    return results
+
+
+def reusable_export_files(pdf_path: str, out_dir: str) -> Set[str]:
+    """
+    Absolute paths in out_dir that an export manifest still vouches for: the
+    manifest files themselves plus their listed outputs, when the manifest was
+    written for this PDF's current size and mtime. Media-dir cleaning keeps
+    these so unchanged PDFs can reuse their PNGs.
+    """
+    current = _export_cache_key(pdf_path)
+    if current is None:
+        return set()
+    keep: Set[str] = set()
+    for kind in ("embedded", "previews"):
+        manifest_path = os.path.join(out_dir, f".{kind}.manifest.json")
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as fh:
+                manifest = json.load(fh)
+        except (OSError, ValueError):
+            continue
+        key = manifest.get("key") or {}
+        if key.get("size") != current["size"] or key.get("mtime_ns") != current["mtime_ns"]:
+            continue
+        keep.add(os.path.abspath(manifest_path))
+        keep.update(os.path.abspath(r["path"]) for r in manifest.get("results") or [] if r.get("path"))
+    return keep
+
+
+def _store_cached_export(out_dir: str, kind: str, key: Optional[Dict[str, Any]], results: List[Dict[str, Any]]) -> None:
+    if key is None or not results:
+        return
+    path = os.path.join(out_dir, f".{kind}.manifest.json")
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump({"key": key, "results": results}, fh)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+_NUM_RE = re.compile(r"[-+]?\d*\.?\d+(?:[eE][-+]?\d+)?")
+_RE_LABEL_NUM = re.compile(r"\b(\d{1,3})\b")
+
+
+def _parse_coord_chunks(s: str) -> List[tuple]:
+    """Group the numbers in a TEI coords string into (page, x, y, w, h) tuples."""
+    if not s:
+        return []
+    nums = list(map(float, _NUM_RE.findall(s)))
+    return [
+        (int(nums[i]), nums[i + 1], nums[i + 2], nums[i + 3], nums[i + 4])
+        for i in range(0, len(nums) - 4, 5)
+    ]
+
+
+# Lowercased page text keyed by (abs path, size, mtime_ns, page index), so
+# repeated keyword passes over the same unchanged PDF skip text extraction.
+_PAGE_TEXT_CACHE: "OrderedDict[Tuple[str, int, int, int], str]" = OrderedDict()
+_PAGE_TEXT_CACHE_MAX = 256
+_PAGE_TEXT_LOCK = threading.Lock()
+
+
+def _page_text_lower(doc: Any, pdf_path: str, page_index: int) -> str:
+    """Return doc[page_index].get_text("text").lower(), cached per unchanged PDF; "" on failure."""
+    try:
+        st = os.stat(pdf_path)
+        key: Optional[Tuple[str, int, int, int]] = (os.path.abspath(pdf_path), st.st_size, st.st_mtime_ns, page_index)
+    except OSError:
+        key = None
+    if key is not None:
+        with _PAGE_TEXT_LOCK:
+            hit = _PAGE_TEXT_CACHE.get(key)
+            if hit is not None:
+                _PAGE_TEXT_CACHE.move_to_end(key)
+                return hit
+    try:
+        text = (doc[page_index].get_text("text") or "").lower()
+    except Exception:
+        return ""
+    if key is not None:
+        with _PAGE_TEXT_LOCK:
+            _PAGE_TEXT_CACHE[key] = text
+            if len(_PAGE_TEXT_CACHE) > _PAGE_TEXT_CACHE_MAX:
+                _PAGE_TEXT_CACHE.popitem(last=False)
+    return text
+
+
+def open_pdf(pdf_path: str) -> Optional[Any]:
+    """
+    Open a PDF once so several exporters can share it (pass it as ``doc=``).
+    Returns None if PyMuPDF is not available; the caller owns closing it.
+    """
+    try:
+        import fitz  # type: ignore
+    except Exception:
+        return None
+    return fitz.open(pdf_path)
+
+
+def close_pdf(doc: Any) -> None:
+    """Close a document from open_pdf() and trim MuPDF's shared object store."""
+    doc.close()
+    try:
+        import fitz  # type: ignore
+    except Exception:
+        return
+    _shrink_store(fitz)
+
+
+# MuPDF keeps decoded fonts/images in a process-wide store; long page loops
+# trim it every this many pages so RSS stays bounded.
+_STORE_SHRINK_EVERY = 20
+
+
+def _shrink_store(fitz: Any) -> None:
+    try:
+        fitz.TOOLS.store_shrink(100)
+    except Exception:
+        pass
+
+
+def _open_doc(fitz: Any, pdf_path: str, doc: Optional[Any]) -> tuple:
+    """Return (doc, owned): reuse a caller-provided document or open our own."""
+    if doc is not None:
+        return doc, False
+    return fitz.open(pdf_path), True
+
+
+def export_embedded_images(pdf_path: str, media_root: Optional[str] = None, max_images: int = 50, doc: Optional[Any] = None) -> List[Dict[str, Any]]:
     """
     Extract embedded images from a PDF using PyMuPDF (fitz) and save them as PNGs.
     Returns a list of figure-like dicts {label, caption, path, source}.
@@ -32,21 +191,33 @@ def export_embedded_images(pdf_path: str, media_root: Optional[str] = None, max_
     out_dir = os.path.join(media_root, stem)
     _ensure_dir(out_dir)
 
+    # Unchanged PDF and params: reuse the PNGs written by the previous run
+    cache_key = _export_cache_key(pdf_path, max_images=max_images)
+    cached = _load_cached_export(out_dir, "embedded", cache_key)
+    if cached is not None:
+        return cached
+
     results: List[Dict[str, Any]] = []
-    doc = fitz.open(pdf_path)
+    doc, owned = _open_doc(fitz, pdf_path, doc)
     count = 0
     for page_index in range(len(doc)):
+        if page_index and page_index % _STORE_SHRINK_EVERY == 0:
+            _shrink_store(fitz)
         page = doc[page_index]
         images = page.get_images(full=True)
         for img_index, img in enumerate(images, start=1):
             xref = img[0]
             try:
                 pix = fitz.Pixmap(doc, xref)
-                if pix.n > 4:  # CMYK or similar -> convert to RGB
+                # Only CMYK/DeviceN needs converting; gray and RGB save as-is.
+                # Checking the colorspace (not pix.n) also catches CMYK without alpha.
+                cs = pix.colorspace
+                if cs is not None and cs.n > 3:
                     pix = fitz.Pixmap(fitz.csRGB, pix)
                 out_name = f"page{page_index+1:03d}_img{img_index:02d}.png"
                 out_path = os.path.join(out_dir, out_name)
                 pix.save(out_path)
+                pix = None  # drop the samples before the next render allocates
                 out_abs = os.path.abspath(out_path)
             except Exception:
                 continue
@@ -61,11 +232,13 @@ def export_embedded_images(pdf_path: str, media_root: Optional[str] = None, max_
                 break
         if count >= max_images:
             break
-    doc.close()
+    if owned:
+        close_pdf(doc)
+    _store_cached_export(out_dir, "embedded", cache_key, results)
     return results
 
 
-def export_page_previews(pdf_path: str, media_root: Optional[str] = None, dpi: int = 144, max_pages: Optional[int] = None) -> List[Dict[str, Any]]:
+def export_page_previews(pdf_path: str, media_root: Optional[str] = None, dpi: int = 144, max_pages: Optional[int] = None, doc: Optional[Any] = None) -> List[Dict[str, Any]]:
     """
     Render page preview PNGs for the first N pages (or all if None).
     Returns a list of figure-like dicts {label, caption, path, source}.
@@ -80,17 +253,25 @@ def export_page_previews(pdf_path: str, media_root: Optional[str] = None, dpi: i
     out_dir = os.path.join(media_root, stem)
     _ensure_dir(out_dir)
 
+    cache_key = _export_cache_key(pdf_path, dpi=dpi, max_pages=max_pages)
+    cached = _load_cached_export(out_dir, "previews", cache_key)
+    if cached is not None:
+        return cached
+
     results: List[Dict[str, Any]] = []
-    doc = fitz.open(pdf_path)
+    doc, owned = _open_doc(fitz, pdf_path, doc)
     max_p = max_pages or len(doc)
     zoom = dpi / 72.0
     mat = fitz.Matrix(zoom, zoom)
     for page_index in range(min(len(doc), max_p)):
+        if page_index and page_index % _STORE_SHRINK_EVERY == 0:
+            _shrink_store(fitz)
         page = doc[page_index]
         pix = page.get_pixmap(matrix=mat, alpha=False)
         out_name = f"page{page_index+1:03d}.png"
         out_path = os.path.join(out_dir, out_name)
         pix.save(out_path)
+        pix = None  # drop the samples before the next render allocates
         out_path = os.path.abspath(out_path)
         results.append({
             "label": f"Page {page_index+1}",
@@ -98,7 +279,9 @@ def export_page_previews(pdf_path: str, media_root: Optional[str] = None, dpi: i
             "path": out_path,
             "source": "page-image",
         })
-    doc.close()
+    if owned:
+        close_pdf(doc)
+    _store_cached_export(out_dir, "previews", cache_key, results)
     return results
 
 
@@ -108,6 +291,7 @@ def export_pages_with_keywords(
     media_root: Optional[str] = None,
     dpi: int = 144,
     max_pages: int = 6,
+    doc: Optional[Any] = None,
 ) -> List[Dict[str, Any]]:
     """
     Render page previews for pages whose text contains any of the given keywords
@@ -127,24 +311,23 @@ def export_pages_with_keywords(
     kws = [k.lower() for k in (keywords or [])]
     if not kws:
         return []
+    # One alternation scans each page once for all keywords
+    kw_re = re.compile("|".join(map(re.escape, kws)))
 
     results: List[Dict[str, Any]] = []
-    doc = fitz.open(pdf_path)
+    doc, owned = _open_doc(fitz, pdf_path, doc)
     zoom = dpi / 72.0
     mat = fitz.Matrix(zoom, zoom)
     for page_index in range(len(doc)):
-        try:
-            text = doc[page_index].get_text("text") or ""
-        except Exception:
-            text = ""
-        s = text.lower()
-        if any(k in s for k in kws):
+        s = _page_text_lower(doc, pdf_path, page_index)
+        if kw_re.search(s):
             page = doc[page_index]
             pix = page.get_pixmap(matrix=mat, alpha=False)
             out_name = f"page{page_index+1:03d}_kw.png"
             out_path = os.path.join(out_dir, out_name)
             try:
                 pix.save(out_path)
+                pix = None  # drop the samples before the next render allocates
             except Exception:
                 continue
             results.append({
@@ -155,7 +338,8 @@ def export_pages_with_keywords(
             })
             if len(results) >= max_pages:
                 break
-    doc.close()
+    if owned:
+        close_pdf(doc)
     return results
 
 
@@ -167,6 +351,7 @@ def export_crops_by_labels(
     y_above: Optional[float] = None,
     y_below: Optional[float] = None,
     max_crops: int = 12,
+    doc: Optional[Any] = None,
 ) -> List[Dict[str, Any]]:
     """
     Heuristic crops around label text like "Figure 1" or "Table 2".
@@ -193,13 +378,20 @@ def export_crops_by_labels(
     for s in labels:
         s0 = (s or "").strip().lower()
         # pull a trailing/leading number token if present
-        import re as _re
-        m = _re.search(r"\b(\d{1,3})\b", s0)
+        m = _RE_LABEL_NUM.search(s0)
         if m:
             label_nums.add(m.group(1))
 
+    # Dynamic margins (read once, not per page)
+    xa = x_margin if x_margin is not None else float(os.getenv("PAPERSLICER_LABEL_X_MARGIN", "24"))
+    ya = y_above if y_above is not None else float(os.getenv("PAPERSLICER_LABEL_Y_ABOVE", "24"))
+    try:
+        yb_fixed = y_below if y_below is not None else float(os.getenv("PAPERSLICER_LABEL_Y_BELOW", "0"))
+    except Exception:
+        yb_fixed = 0.0
+
     results: List[Dict[str, Any]] = []
-    doc = fitz.open(pdf_path)
+    doc, owned = _open_doc(fitz, pdf_path, doc)
     crops = 0
     for page_index in range(len(doc)):
         page = doc[page_index]
@@ -224,15 +416,8 @@ def export_crops_by_labels(
                     break
         # Sort anchors by vertical position
         anchors.sort(key=lambda r: (r.y0, r.x0))
-        # Dynamic margins
-        xa = x_margin if x_margin is not None else float(os.getenv("PAPERSLICER_LABEL_X_MARGIN", "24"))
-        ya = y_above if y_above is not None else float(os.getenv("PAPERSLICER_LABEL_Y_ABOVE", "24"))
         # set below bound up to next anchor to avoid overrun; default span 60% page height
         default_span = 0.6 * page_rect.height
-        try:
-            yb_fixed = y_below if y_below is not None else float(os.getenv("PAPERSLICER_LABEL_Y_BELOW", "0"))
-        except Exception:
-            yb_fixed = 0.0
         for idx, a in enumerate(anchors, start=1):
             y0 = max(page_rect.y0, a.y0 - ya)
             # determine y1: next anchor start minus small gap, else default span or page bottom
@@ -251,6 +436,7 @@ def export_crops_by_labels(
             out_path = os.path.join(out_dir, out_name)
             try:
                 pix.save(out_path)
+                pix = None  # drop the samples before the next render allocates
             except Exception:
                 continue
             results.append({
@@ -264,7 +450,8 @@ def export_crops_by_labels(
                 break
         if crops >= max_crops:
             break
-    doc.close()
+    if owned:
+        close_pdf(doc)
     return results
 
 def export_from_tei_coords(
@@ -272,6 +459,7 @@ def export_from_tei_coords(
     coords_str: str,
     media_root: Optional[str] = None,
     pad_pct: Optional[float] = None,
+    doc: Optional[Any] = None,
 ) -> List[Dict[str, Any]]:
     """
     Crop images from PDF using GROBID TEI coordinates.
@@ -289,36 +477,23 @@ def export_from_tei_coords(
     out_dir = os.path.join(media_root, stem)
     _ensure_dir(out_dir)
 
-    def _parse_chunks(s: str) -> List[tuple]:
-        chunks: List[tuple] = []
-        if not s:
-            return chunks
-        parts = [p.strip() for p in re.split(r"[;\s]+", s) if p.strip()]
-        nums: List[float] = []
-        for p in parts:
-            try:
-                nums.append(float(p))
-            except ValueError:
-                for q in p.split(','):
-                    q = q.strip()
-                    if not q:
-                        continue
-                    try:
-                        nums.append(float(q))
-                    except ValueError:
-                        pass
-        for i in range(0, len(nums), 5):
-            if i + 4 < len(nums):
-                page, x, y, w, h = nums[i:i+5]
-                chunks.append((int(page), x, y, w, h))
-        return chunks
-
-    import re
-    coords = _parse_chunks(coords_str)
+    coords = _parse_coord_chunks(coords_str)
     if not coords:
         return []
 
-    doc = fitz.open(pdf_path)
+    # Padding and DPI are the same for every crop; resolve them once
+    try:
+        pad = pad_pct if pad_pct is not None else float(os.getenv("PAPERSLICER_CROP_PAD_PCT", "0.06"))
+    except Exception:
+        pad = 0.06
+    try:
+        dpi = int(os.getenv("PAPERSLICER_CROP_DPI", "220"))
+    except Exception:
+        dpi = 220
+    zoom = max(1.0, dpi / 72.0)
+    mat = fitz.Matrix(zoom, zoom)
+
+    doc, owned = _open_doc(fitz, pdf_path, doc)
     out: List[Dict[str, Any]] = []
     for idx, (page_no, x, y, w, h) in enumerate(coords, start=1):
         if page_no <= 0 or page_no > len(doc):
@@ -339,21 +514,10 @@ def export_from_tei_coords(
             use_xyxy = True
         rect = rect_xyxy if use_xyxy else rect_wh
         # Apply optional padding to include margins around crops
-        try:
-            pad = pad_pct if pad_pct is not None else float(os.getenv("PAPERSLICER_CROP_PAD_PCT", "0.06"))
-        except Exception:
-            pad = 0.06
         if pad and rect.width > 1 and rect.height > 1:
             dx = rect.width * pad
             dy = rect.height * pad
             rect = fitz.Rect(rect.x0 - dx, rect.y0 - dy, rect.x1 + dx, rect.y1 + dy) & page.rect
-        # DPI control
-        try:
-            dpi = int(os.getenv("PAPERSLICER_CROP_DPI", "220"))
-        except Exception:
-            dpi = 220
-        zoom = max(1.0, dpi / 72.0)
-        mat = fitz.Matrix(zoom, zoom)
         try:
             pix = page.get_pixmap(matrix=mat, clip=rect, alpha=False)
         except Exception:
@@ -362,6 +526,7 @@ def export_from_tei_coords(
         out_path = os.path.join(out_dir, out_name)
         try:
             pix.save(out_path)
+            pix = None  # drop the samples before the next render allocates
         except Exception:
             continue
         out_path = os.path.abspath(out_path)
@@ -371,5 +536,6 @@ def export_from_tei_coords(
             "path": out_path,
             "source": "grobid+crop",
         })
-    doc.close()
+    if owned:
+        close_pdf(doc)
     return out
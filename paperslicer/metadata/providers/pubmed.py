@@ -7,6 +7,8 @@ from lxml import etree
 
 EUTILS = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
 
+_XP_ABSTRACT_TEXT = etree.XPath("//Abstract/AbstractText")
+
 
 def _params_base() -> Dict[str, str]:
     p: Dict[str, str] = {"retmode": "json"}
@@ -54,7 +56,7 @@ def fetch_abstract_by_pmid(pmid: str, timeout: int = 12) -> Optional[str]:
         root = etree.fromstring(r.content)
         # //Abstract/AbstractText possibly multiple
         texts: List[str] = []
-        for el in root.xpath("//Abstract/AbstractText"):
+        for el in _XP_ABSTRACT_TEXT(root):
             t = " ".join((el.text or "").split())
             if t:
                 texts.append(t)
@@ -6,16 +6,15 @@ from paperslicer.extractors.normalizer import TextNormalizer
 from paperslicer.extractors.sections_regex import SectionExtractor
 from paperslicer.extractors.captions import CaptionExtractor
 from paperslicer.media.filters import filter_media_collections
-from paperslicer.media.exporter import _safe_stem
+from paperslicer.media.exporter import _safe_stem, reusable_export_files
 
 # NEW
 from paperslicer.grobid.client import GrobidClient
 from paperslicer.grobid.manager import GrobidManager
-from lxml import etree  # for checking parseability of TEI
 from paperslicer.metadata.resolver import ensure_abstract
 from paperslicer.journals import review as review_profile
 
-from typing import Optional, Dict, Any, Tuple, List, Iterable
+from typing import Optional, Dict, Any, Tuple, List, Iterable, Union
 
 
 def _merge_table_entries(rec: PaperRecord) -> None:
@@ -76,8 +75,13 @@ def _merge_table_entries(rec: PaperRecord) -> None:
 class Pipeline:
     def __init__(self, try_start_grobid: bool = True, xml_save_dir: Optional[str] = None,
                  export_images: bool = False, images_mode: str = "embedded",
-                 review_mode: Optional[bool] = None):
+                 review_mode: Optional[bool] = None,
+                 grobid_client: Optional[GrobidClient] = None):
         self.try_start_grobid = try_start_grobid
+        # Caller-owned client shared across PDFs (keep-alive); None = one per PDF
+        self.grobid_client = grobid_client
+        # Why the last process() call fell back from GROBID, if it did
+        self.grobid_error: Optional[Exception] = None
         self.xml_save_dir = xml_save_dir
         self.export_images = export_images
         self.images_mode = images_mode
@@ -98,11 +102,27 @@ class Pipeline:
         if target in self._cleaned_media_dirs:
             return
         self._cleaned_media_dirs.add(target)
-        if os.path.isdir(target):
+        if not os.path.isdir(target):
+            return
+        # Keep PNGs (and manifests) an export manifest still vouches for, so
+        # exporters can reuse them for an unchanged PDF; wipe everything else.
+        keep = reusable_export_files(pdf_path, target)
+        if not keep:
             try:
                 shutil.rmtree(target)
             except Exception:
                 pass
+            return
+        for entry in os.scandir(target):
+            if os.path.abspath(entry.path) in keep:
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path)
+                else:
+                    os.remove(entry.path)
+            except Exception:
+                pass
 
     @staticmethod
     def _remove_paths(paths: Iterable[str]) -> None:
@@ -115,28 +135,37 @@ class Pipeline:
             except Exception:
                 continue
 
-    def _try_grobid(self, pdf_path: str) -> Optional[PaperRecord]:
-        mgr = GrobidManager()
-        if not mgr.is_available() and self.try_start_grobid:
-            mgr.start()  # best-effort; ignore result here
-        
-        if not mgr.is_available():
-            return None
-
-        # If available, process and map TEI to our schema
-        cli = GrobidClient()
+    def _tei_save_dir(self) -> str:
         # Auto-save TEI into data/xml by default. Allow env overrides.
-        save_dir = (
+        return (
             self.xml_save_dir
             or os.getenv("TEI_SAVE_DIR")
             or os.getenv("PAPERSLICER_XML_DIR")  # backward-compat
             or os.path.join("data", "xml")
         )
-        tei_bytes, tei_path = cli.process_fulltext(pdf_path, save_dir=save_dir)
-        # minimal TEI sanity check
-        etree.fromstring(tei_bytes)
 
-        # Very light TEI mapping for now (you’ll expand later)
+    def _try_grobid(self, pdf_path: str, tei: Optional[Tuple[bytes, Optional[str]]] = None) -> Optional[PaperRecord]:
+        if tei is not None:
+            # TEI already fetched by the caller (e.g. CLI prefetch); map it directly
+            tei_bytes, tei_path = tei
+        else:
+            mgr = GrobidManager()
+            if not mgr.is_available() and self.try_start_grobid:
+                mgr.start()  # best-effort; ignore result here
+
+            if not mgr.is_available():
+                return None
+
+            # If available, process and map TEI to our schema
+            save_dir = self._tei_save_dir()
+            if self.grobid_client is not None:
+                tei_bytes, tei_path = self.grobid_client.process_fulltext(pdf_path, save_dir=save_dir)
+            else:
+                with GrobidClient() as cli:
+                    tei_bytes, tei_path = cli.process_fulltext(pdf_path, save_dir=save_dir)
+
+        # Very light TEI mapping for now (you’ll expand later).
+        # tei_to_record parses the TEI once and raises on malformed XML.
         from paperslicer.grobid.parser import tei_to_record  # add this file when ready
         rec = tei_to_record(tei_bytes, pdf_path)
         _merge_table_entries(rec)
@@ -158,14 +187,19 @@ class Pipeline:
         # Basic image export if requested
         if self.export_images:
             self._clean_media_dir(pdf_path)
+            media_doc = None
             try:
                 from paperslicer.media.exporter import (
+                    open_pdf,
+                    close_pdf,
                     export_embedded_images,
                     export_page_previews,
                     export_from_tei_coords,
                     export_pages_with_keywords,
                     export_crops_by_labels,
                 )
+                # Open the PDF once; every PyMuPDF exporter below reuses it
+                media_doc = open_pdf(pdf_path)
                 # YOLO PubLayNet detector (optional dependency)
                 try:
                     from paperslicer.media.detector_hf import detect_publaynet_crops
@@ -197,7 +231,7 @@ class Pipeline:
                     for item in coll:
                         coords = item.get("coords") if isinstance(item, dict) else None
                         if coords:
-                            crops = export_from_tei_coords(pdf_path, coords)
+                            crops = export_from_tei_coords(pdf_path, coords, doc=media_doc)
                             if crops:
                                 # attach first crop to this item; add extras as separate figures
                                 item["path"] = crops[0].get("path")
@@ -217,7 +251,7 @@ class Pipeline:
                         pass
                 # 2) If no coords-derived media found and mode is embedded/auto, export embedded images
                 if self.images_mode in ("embedded", "auto"):
-                    emb = export_embedded_images(pdf_path)
+                    emb = export_embedded_images(pdf_path, doc=media_doc)
                     if emb:
                         rec.figures.extend(emb)
                 # 2.5) Docling tables (optional; content-based) if requested and still no tables
@@ -295,43 +329,58 @@ class Pipeline:
                                     s = f"Figure {s}"
                             labels.append(s)
                     if labels:
-                        crops = export_crops_by_labels(pdf_path, labels, max_crops=8)
+                        crops = export_crops_by_labels(pdf_path, labels, max_crops=8, doc=media_doc)
                         if crops:
                             rec.figures.extend(crops)
                 # 4) If still no saved media paths, try keyword-targeted page previews (Figure/Table)
                 has_paths = any((isinstance(i, dict) and i.get("path")) for i in (rec.figures + rec.tables))
                 if not has_paths:
-                    kw_pages = export_pages_with_keywords(pdf_path, ["figure", "table"], max_pages=6)
+                    kw_pages = export_pages_with_keywords(pdf_path, ["figure", "table"], max_pages=6, doc=media_doc)
                     if kw_pages:
                         rec.figures.extend(kw_pages)
                 # 5) If still no saved media paths for this doc and mode allows, export a few page previews
                 has_paths = any((isinstance(i, dict) and i.get("path")) for i in (rec.figures + rec.tables))
                 if self.images_mode in ("pages", "auto") and not has_paths:
-                    pages = export_page_previews(pdf_path, max_pages=2)
+                    pages = export_page_previews(pdf_path, max_pages=2, doc=media_doc)
                     if pages:
                         rec.figures.extend(pages)
                 # 6) Last-resort safety: if still no saved paths, force minimal page previews
                 has_paths = any((isinstance(i, dict) and i.get("path")) for i in (rec.figures + rec.tables))
                 if not has_paths:
-                    pages = export_page_previews(pdf_path, max_pages=2)
+                    pages = export_page_previews(pdf_path, max_pages=2, doc=media_doc)
                     if pages:
                         rec.figures.extend(pages)
             except Exception:
                 pass
+            finally:
+                if media_doc is not None:
+                    close_pdf(media_doc)
         _merge_table_entries(rec)
         removed_paths = filter_media_collections(rec, pdf_path)
         self._remove_paths(removed_paths)
         return rec
 
-    def process(self, pdf_path: str) -> PaperRecord:
+    def process(
+        self,
+        pdf_path: str,
+        tei: Union[Tuple[bytes, Optional[str]], Exception, None] = None,
+    ) -> PaperRecord:
+        """Process one PDF. ``tei`` is an optional (tei_bytes, tei_path) pair
+        already returned by GrobidClient.process_fulltext for this PDF, or the
+        exception that request raised; a failed request is not sent again.
+        The GROBID failure behind a fallback record is kept in ``grobid_error``."""
+        self.grobid_error = None
         # Prefer GROBID if reachable (or can be auto-started)
-        try:
-            rec = self._try_grobid(pdf_path)
-            if rec is not None:
-                return rec
-        except Exception:
-            # If GROBID fails mid-flight, fall back gracefully
-            pass
+        if isinstance(tei, Exception):
+            self.grobid_error = tei
+        else:
+            try:
+                rec = self._try_grobid(pdf_path, tei)
+                if rec is not None:
+                    return rec
+            except Exception as e:
+                # If GROBID fails mid-flight, fall back gracefully
+                self.grobid_error = e
 
         # Fallback: regex/PyMuPDF pipeline
         raw = self.pdf.extract(pdf_path)
@@ -343,8 +392,11 @@ class Pipeline:
         rec = PaperRecord(meta=meta, sections=sec, figures=figs, tables=tabs)
         if self.export_images:
             self._clean_media_dir(pdf_path)
+            media_doc = None
             try:
                 from paperslicer.media.exporter import (
+                    open_pdf,
+                    close_pdf,
                     export_embedded_images,
                     export_page_previews,
                     export_pages_with_keywords,
@@ -370,9 +422,11 @@ class Pipeline:
                     from paperslicer.media.docling_adapter import extract_tables_docling
                 except Exception:
                     extract_tables_docling = None  # type: ignore
+                # Open the PDF once; every PyMuPDF exporter below reuses it
+                media_doc = open_pdf(pdf_path)
                 media = []
                 if self.images_mode in ("embedded", "auto"):
-                    media = export_embedded_images(pdf_path)
+                    media = export_embedded_images(pdf_path, doc=media_doc)
                 # If none found, try detector crops first
                 disable_detectors = (os.getenv("PAPERSLICER_DISABLE_DETECTORS") in {"1","true","yes","on"})
                 if not media and detect_publaynet_crops is not None and not disable_detectors:
@@ -419,16 +473,19 @@ class Pipeline:
                     # no structured rec.tables here; rely on captions extractor if present
                     # fall back to generic keywords next
                     if labels:
-                        media = export_crops_by_labels(pdf_path, labels, max_crops=6)
+                        media = export_crops_by_labels(pdf_path, labels, max_crops=6, doc=media_doc)
                 if not media:
-                    media = export_pages_with_keywords(pdf_path, ["figure", "table"], max_pages=6)
+                    media = export_pages_with_keywords(pdf_path, ["figure", "table"], max_pages=6, doc=media_doc)
                 if (self.images_mode in ("pages", "auto") and not media):
-                    media = export_page_previews(pdf_path, max_pages=5)
+                    media = export_page_previews(pdf_path, max_pages=5, doc=media_doc)
                 # Safety fallback: if still empty, force minimal previews
                 if not media:
-                    media = export_page_previews(pdf_path, max_pages=2)
+                    media = export_page_previews(pdf_path, max_pages=2, doc=media_doc)
                 rec.figures.extend(media)
             except Exception:
                 pass
+            finally:
+                if media_doc is not None:
+                    close_pdf(media_doc)
         _merge_table_entries(rec)
         return rec
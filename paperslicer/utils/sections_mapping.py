@@ -19,6 +19,7 @@ We intentionally skip non-content boilerplate (acknowledgements, funding, etc.).
 """
 
 import re
+from functools import lru_cache
 from typing import Optional
 
 
@@ -48,14 +49,19 @@ NON_CONTENT_KEYS = {
 }
 
 
+_RE_LEADING_BULLETS = re.compile(r"^[|>•\-\u2013\u2014\s]+")
+_RE_LEADING_NUMBERING = re.compile(r"^(?:[ivxlcdm]+\.|\d+(?:\.\d+)*\.?)[\s\-:]*", re.I)
+_RE_WS = re.compile(r"\s+")
+
+
 # Exact (lowercased) title to canonical key
 def _sanitize_heading(name: str) -> str:
     s = (name or "").strip().lower()
     # Remove leading pipes/bullets/dashes and numbering like "1.", "3.2.", "ii.", etc.
-    s = re.sub(r"^[|>•\-\u2013\u2014\s]+", "", s)  # leading punctuation/bullets
-    s = re.sub(r"^(?:[ivxlcdm]+\.|\d+(?:\.\d+)*\.?)[\s\-:]*", "", s, flags=re.I)  # numbering
+    s = _RE_LEADING_BULLETS.sub("", s)  # leading punctuation/bullets
+    s = _RE_LEADING_NUMBERING.sub("", s)  # numbering
     # Collapse multiple spaces
-    s = re.sub(r"\s+", " ", s)
+    s = _RE_WS.sub(" ", s)
     return s.strip()
 
 
@@ -284,14 +290,12 @@ EXACT_MAP = {
     "heterogeneity assessment": "materials_and_methods",
     "heterogeneity analysis": "materials_and_methods",
     "rob assessment": "materials_and_methods",
-    "risk of bias assessment": "materials_and_methods",
     "correlation analysis": "materials_and_methods",
     "protocol registration and reporting format": "materials_and_methods",
     "clinical assessment of primary and secondary outcomes": "materials_and_methods",
     "clinical assessment": "materials_and_methods",
     # Discussion / Conclusions
     "strengths": "discussion",
-    "strengths and limitations": "discussion",
     "limitations and strengths": "discussion",
     "study strengths": "discussion",
     "implications for clinical practice and future research": "conclusions",
@@ -303,43 +307,58 @@ EXACT_MAP = {
 }
 
 
+# Fuzzy families, tried in priority order after the exact lookup. Each family
+# is one compiled alternation, so a heading is scanned once per family rather
+# than once per substring.
+def _any_of(*needles: str) -> "re.Pattern[str]":
+    return re.compile("|".join(re.escape(k) for k in needles))
+
+
+_RE_METHODS_FAMILY = _any_of(
+    "method", "methodology", "statistic", "power analysis", "sample size",
+    "eligibility", "inclusion", "exclusion", "sample preparation", "specimen preparation",
+    "participants", "population", "search strategy", "study selection", "data extraction",
+    "quality assessment", "methodological quality", "risk of bias", "preoperative",
+    "indication", "contraindication", "systemic condition", "local condition",
+    "outcome measure", "randomization", "blinding", "charting", "synthesis",
+    "protocol registration", "heterogeneity",
+)
+_RE_INTRO_FAMILY = _any_of(
+    "introduc", "aim", "objective", "objectives", "purpose", "background",
+    "hypothesis", "hypotheses", "focused question", "focus question",
+)
+_RE_CONCLUSIONS_FAMILY = _any_of("conclusion", "clinical significance")
+_RE_DISCUSSION_FAMILY = _any_of("discussion", "limitation")
+
+
+# Pure function of the heading text; headings repeat across divs and papers.
+@lru_cache(maxsize=1024)
 def canonical_section_name(name: str) -> str:
     n = _sanitize_heading(name)
     if not n:
         return ""
     # Exact matches first
-    if n in EXACT_MAP:
-        return EXACT_MAP[n]
-    # (additional exact titles added in EXACT_MAP below)
+    key = EXACT_MAP.get(n)
+    if key is not None:
+        return key
     # Composite and fuzzy matches
     # e.g., "results and discussion" variants
     if "results" in n and "discussion" in n:
         return "results_and_discussion"
     # Methods family including methodologic phrases
-    if any(k in n for k in [
-        "method", "methodology", "statistic", "power analysis", "sample size",
-        "eligibility", "inclusion", "exclusion", "sample preparation", "specimen preparation",
-        "participants", "population", "search strategy", "study selection", "data extraction",
-        "quality assessment", "methodological quality", "risk of bias", "preoperative",
-        "indication", "contraindication", "systemic condition", "local condition",
-        "outcome measure", "randomization", "blinding", "charting", "synthesis",
-        "protocol registration", "heterogeneity",
-    ]):
+    if _RE_METHODS_FAMILY.search(n):
         return "materials_and_methods"
     # Intro-like
-    if any(k in n for k in [
-        "introduc", "aim", "objective", "objectives", "purpose", "background",
-        "hypothesis", "hypotheses", "focused question", "focus question"
-    ]):
+    if _RE_INTRO_FAMILY.search(n):
         return "introduction"
     # Conclusions-like
-    if "conclusion" in n or "clinical significance" in n:
+    if _RE_CONCLUSIONS_FAMILY.search(n):
         return "conclusions"
     # Results-like
     if "result" in n:
         return "results"
     # Discussion-like
-    if "discussion" in n or "limitation" in n:
+    if _RE_DISCUSSION_FAMILY.search(n):
         return "discussion"
     # Fallback: normalize spaces
     return n.replace(" ", "_")
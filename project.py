@@ -2,7 +2,17 @@
 import argparse
 import json
 import os
-from typing import Dict, List, Iterable, Optional
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import closing
+from typing import TYPE_CHECKING, Callable, Deque, Dict, List, Iterable, Iterator, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    from paperslicer.grobid.client import GrobidClient
+
+# (tei_bytes, saved_tei_path) as returned by GrobidClient.process_fulltext,
+# or the exception that request raised
+TEIResult = Union[Tuple[bytes, Optional[str]], Exception]
 
 # ---- CS50 top-level functions (wrappers) ----
 
@@ -21,31 +31,64 @@ def extract_sections_from_text(text: str) -> Dict[str, str]:
     from paperslicer.extractors.sections_regex import SectionExtractor
     return SectionExtractor().extract(text)
 
-def process_pdf_to_record(path: str) -> Dict[str, object]:
-    """Step 5+: full pipeline PDF->JSON dict (via Pipeline)."""
-    from paperslicer.pipeline import Pipeline
-    xml_dir: Optional[str] = (
+def _xml_dir() -> str:
+    return (
         os.getenv("TEI_SAVE_DIR")
         or os.getenv("PAPERSLICER_XML_DIR")
         or os.path.join("data", "xml")
     )
+
+def process_pdf_to_record(
+    path: str,
+    client: Optional["GrobidClient"] = None,
+    tei: Optional[TEIResult] = None,
+) -> Dict[str, object]:
+    """Step 5+: full pipeline PDF->JSON dict (via Pipeline).
+
+    Pass a shared GrobidClient to reuse its keep-alive connections across PDFs,
+    and ``tei`` when the GROBID request for this PDF was already made (its
+    result, or the exception it raised so the PDF is not sent again).
+    """
+    from paperslicer.pipeline import Pipeline
+    xml_dir: Optional[str] = _xml_dir()
     export_images_env = (os.getenv("EXPORT_IMAGES") or "0").lower() in {"1", "true", "yes"}
     images_mode_env = os.getenv("IMAGES_MODE") or "embedded"
     pipe = Pipeline(try_start_grobid=True, xml_save_dir=xml_dir,
-                    export_images=export_images_env, images_mode=images_mode_env)
-    rec = pipe.process(path)
+                    export_images=export_images_env, images_mode=images_mode_env,
+                    grobid_client=client)
+    rec = pipe.process(path, tei=tei)
     return rec.to_dict()
 
 # ---- CLI (will become useful by Step 5) ----
 
+def _scan_pdfs(root: str) -> Iterable[str]:
+    """Yield PDF paths under root using os.scandir (one dirent read per entry).
+
+    Mirrors os.walk defaults: symlinked directories are not descended and
+    unreadable directories are skipped.
+    """
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    if not entry.is_symlink():
+                        stack.append(entry.path)
+                elif entry.name.lower().endswith(".pdf"):
+                    yield entry.path
+
+
 def _iter_pdfs(root: str) -> List[str]:
     if os.path.isdir(root):
-        acc = []
-        for dp, _, files in os.walk(root):
-            for f in files:
-                if f.lower().endswith(".pdf"):
-                    acc.append(os.path.join(dp, f))
-        return sorted(acc)
+        return sorted(_scan_pdfs(root))
     return [root] if root.lower().endswith(".pdf") else []
 
 def _write_json(obj: Dict[str, object], out_path: str) -> None:
@@ -54,12 +97,78 @@ def _write_json(obj: Dict[str, object], out_path: str) -> None:
         json.dump(obj, f, ensure_ascii=False, indent=2)
 
 
-def _iter_json_dicts(paths: Iterable[str]) -> Iterable[Dict[str, object]]:
-    for p in paths:
-        try:
-            yield process_pdf_to_record(p)
-        except Exception as e:
-            yield {"error": str(e), "meta": {"source_path": p}}
+def _worker_count() -> int:
+    try:
+        return max(1, int(os.getenv("PAPERSLICER_GROBID_WORKERS", "4")))
+    except ValueError:
+        return 1
+
+
+def _fetch_tei(client: "GrobidClient", path: str) -> TEIResult:
+    try:
+        return client.process_fulltext(path, save_dir=_xml_dir())
+    except Exception as e:
+        # Hand the failure to the pipeline so it falls back without a retry
+        return e
+
+
+def _prefetch_tei(
+    paths: List[str], client: Optional["GrobidClient"]
+) -> Iterator[Tuple[str, Optional[TEIResult]]]:
+    """Yield (path, tei) in input order while later PDFs are already at GROBID.
+
+    Only the blocking processFulltextDocument requests run on the thread pool;
+    TEI mapping and PyMuPDF media export stay on the caller's thread, since
+    PyMuPDF must not be used from several threads. At most 2 x workers
+    requests are queued ahead, and queued ones are cancelled as soon as the
+    consumer stops (error, Ctrl-C or close()). tei is the exception when the
+    request failed (the pipeline falls back without re-sending the PDF), and
+    None when nothing was prefetched because GROBID is not reachable.
+    """
+    workers = min(_worker_count(), len(paths))
+    if client is None or workers <= 1 or not client.is_available():
+        for p in paths:
+            yield p, None
+        return
+    ex = ThreadPoolExecutor(max_workers=workers)
+    pending: Deque[Tuple[str, "Future[TEIResult]"]] = deque()
+    it = iter(paths)
+    try:
+        for p in it:
+            pending.append((p, ex.submit(_fetch_tei, client, p)))
+            if len(pending) >= 2 * workers:
+                break
+        while pending:
+            p, fut = pending.popleft()
+            nxt = next(it, None)
+            if nxt is not None:
+                pending.append((nxt, ex.submit(_fetch_tei, client, nxt)))
+            yield p, fut.result()
+    finally:
+        ex.shutdown(wait=False, cancel_futures=True)
+
+
+def _safe_process(
+    p: str, client: Optional["GrobidClient"] = None, tei: Optional[TEIResult] = None
+) -> Dict[str, object]:
+    try:
+        return process_pdf_to_record(p, client, tei)
+    except Exception as e:
+        return {"error": str(e), "meta": {"source_path": p}}
+
+
+def _iter_records(
+    paths: List[str],
+    client: Optional["GrobidClient"],
+    func: Callable[..., Dict[str, object]] = process_pdf_to_record,
+) -> Iterator[Tuple[str, Dict[str, object]]]:
+    for p, tei in _prefetch_tei(paths, client):
+        yield p, func(p, client, tei)
+
+
+def _iter_json_dicts(paths: List[str], client: Optional["GrobidClient"] = None) -> Iterator[Dict[str, object]]:
+    for _, d in _iter_records(paths, client, _safe_process):
+        yield d
 
 
 def main():
@@ -139,14 +248,29 @@ def main():
     if args.images_mode:
         os.environ["IMAGES_MODE"] = args.images_mode
 
+    # Start GROBID (if needed) once, before any prefetch threads exist
+    from paperslicer.grobid.manager import GrobidManager
+    try:
+        GrobidManager().ensure_running()
+    except Exception:
+        pass
+
+    # One GROBID client (and its keep-alive connections) for the whole batch.
+    # autostart is off: prefetch threads must not race to start the service.
+    from paperslicer.grobid.client import GrobidClient
+    with GrobidClient(autostart=False) as client:
+        _write_outputs(args, pdfs, out, client)
+
+
+def _write_outputs(args: argparse.Namespace, pdfs: List[str], out: str, client: "GrobidClient") -> None:
     # JSONL mode
     if args.jsonl or (out.lower().endswith(".jsonl")):
         os.makedirs(os.path.dirname(out), exist_ok=True)
         count = 0
         seen_doi = set()
         seen_title = set()
-        with open(out, "w", encoding="utf-8") as fh:
-            for d in _iter_json_dicts(pdfs):
+        with open(out, "w", encoding="utf-8") as fh, closing(_iter_json_dicts(pdfs, client)) as dicts:
+            for d in dicts:
                 if args.dedup and isinstance(d, dict):
                     doi = ((d.get("meta") or {}).get("doi") or "").strip().lower()
                     title = ((d.get("meta") or {}).get("title") or "").strip().lower()
@@ -171,35 +295,36 @@ def main():
         seen_doi = set()
         seen_title = set()
         written = 0
-        for p in pdfs:
-            d = process_pdf_to_record(p)
-            if args.dedup and isinstance(d, dict):
-                doi = ((d.get("meta") or {}).get("doi") or "").strip().lower()
-                title = ((d.get("meta") or {}).get("title") or "").strip().lower()
-                key = doi or title
-                if key:
-                    if doi and doi in seen_doi:
-                        continue
-                    if (not doi) and title and title in seen_title:
-                        continue
-                    if doi:
-                        seen_doi.add(doi)
-                    elif title:
-                        seen_title.add(title)
-            stem = os.path.splitext(os.path.basename(p))[0]
-            _write_json(d, os.path.join(out, f"{stem}.json"))
-            written += 1
+        with closing(_iter_records(pdfs, client)) as records:
+            for p, d in records:
+                if args.dedup and isinstance(d, dict):
+                    doi = ((d.get("meta") or {}).get("doi") or "").strip().lower()
+                    title = ((d.get("meta") or {}).get("title") or "").strip().lower()
+                    key = doi or title
+                    if key:
+                        if doi and doi in seen_doi:
+                            continue
+                        if (not doi) and title and title in seen_title:
+                            continue
+                        if doi:
+                            seen_doi.add(doi)
+                        elif title:
+                            seen_title.add(title)
+                stem = os.path.splitext(os.path.basename(p))[0]
+                _write_json(d, os.path.join(out, f"{stem}.json"))
+                written += 1
         print(f"Wrote {written} JSON files to {out}")
         return
 
     # If a single .json path provided
     if len(pdfs) == 1:
-        _write_json(process_pdf_to_record(pdfs[0]), out)
+        _write_json(process_pdf_to_record(pdfs[0], client), out)
         print(f"Wrote JSON to {out}")
     else:
         # Multiple PDFs -> write a list into the single JSON file
         os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
-        payload = list(_iter_json_dicts(pdfs))
+        with closing(_iter_json_dicts(pdfs, client)) as dicts:
+            payload = list(dicts)
         with open(out, "w", encoding="utf-8") as f:
             json.dump(payload, f, ensure_ascii=False, indent=2)
         print(f"Wrote {len(payload)} records to {out}")
@@ -1,6 +1,9 @@
 import pytest
 import os
 import shutil
+import threading
+import project
+import paperslicer.grobid.client as client_mod
 from paperslicer.grobid.manager import GrobidManager
 from paperslicer.grobid.client import GrobidClient
 
@@ -34,14 +37,15 @@ def test_grobid_client_saves_xml_to_dir(monkeypatch, tmp_path):
         def raise_for_status(self):
             return None
 
-    def fake_post(url, files, data, timeout):
+    def fake_post(self, url, files, data, timeout):
         # Ensure we were called with a file-like object
         assert "input" in files
         return DummyResp(tei_bytes)
 
-    # Patch requests.post used inside the client
-    import paperslicer.grobid.client as client_mod
-    monkeypatch.setattr(client_mod.requests, "post", fake_post)
+    # Patch the session post used inside the client
+    monkeypatch.setattr(client_mod.requests.Session, "post", fake_post)
+    # Exercise the plain multipart path regardless of requests_toolbelt
+    monkeypatch.setattr(client_mod, "MultipartEncoder", None)
 
     # Use a nested, non-existent dir to ensure it's created
     save_dir = tmp_path / "nested" / "xml"
@@ -60,6 +64,155 @@ def test_grobid_client_saves_xml_to_dir(monkeypatch, tmp_path):
     assert out_file.read_bytes() == tei_bytes
 
 
+def test_grobid_client_streams_upload_with_multipart_encoder(monkeypatch, tmp_path):
+    """When requests_toolbelt is present the PDF is streamed via MultipartEncoder."""
+    pdf_path = tmp_path / "stream.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4\n...")
+    tei_bytes = b"<TEI xmlns=\"http://www.tei-c.org/ns/1.0\"><teiHeader/><text/></TEI>"
+
+    class StubEncoder:
+        content_type = "multipart/form-data; boundary=stub"
+
+        def __init__(self, fields):
+            self.fields = fields
+
+    class DummyResp:
+        content = tei_bytes
+
+        def raise_for_status(self):
+            return None
+
+    seen = {}
+
+    def fake_post(self, url, data=None, headers=None, timeout=None, **kwargs):
+        assert "files" not in kwargs, "streaming path must not buffer via files="
+        seen["url"] = url
+        seen["encoder"] = data
+        seen["headers"] = headers
+        name, fh, ctype = data.fields["input"]
+        seen["input"] = (name, fh.read(), ctype)
+        return DummyResp()
+
+    monkeypatch.setattr(client_mod.requests.Session, "post", fake_post)
+    monkeypatch.setattr(client_mod, "MultipartEncoder", StubEncoder)
+    monkeypatch.setattr(GrobidClient, "is_available", lambda self: True)
+
+    cli = GrobidClient(base_url="http://fake:8070", autostart=False)
+    out_bytes, saved_path = cli.process_fulltext(str(pdf_path))
+
+    assert out_bytes == tei_bytes
+    assert saved_path is None
+    assert seen["url"] == "http://fake:8070/api/processFulltextDocument"
+    assert isinstance(seen["encoder"], StubEncoder)
+    assert seen["headers"] == {"Content-Type": StubEncoder.content_type}
+    assert seen["input"] == ("stream.pdf", b"%PDF-1.4\n...", "application/pdf")
+    fields = seen["encoder"].fields
+    assert fields["generateIDs"] == "1"
+    assert fields["teiCoordinates"] == "figure,table"
+    assert {"consolidateHeader", "consolidateCitations", "includeRawAffiliations"} <= set(fields)
+    assert all(isinstance(v, str) for k, v in fields.items() if k != "input")
+
+
+def test_grobid_client_context_manager_closes_session(monkeypatch):
+    closed = []
+    monkeypatch.setattr(client_mod.requests.Session, "close", lambda self: closed.append(self))
+
+    with GrobidClient(base_url="http://fake:8070") as cli:
+        session = cli._session
+    assert closed == [session]
+
+
+class _FakePrefetchClient:
+    """GROBID stand-in whose requests run a per-path hook (for synchronisation)."""
+
+    def __init__(self, hooks=None):
+        self.hooks = hooks or {}
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def is_available(self):
+        return True
+
+    def process_fulltext(self, path, save_dir=None):
+        with self._lock:
+            self.calls.append(path)
+        hook = self.hooks.get(path)
+        if hook is not None:
+            hook()
+        return f"<TEI>{path}</TEI>".encode(), None
+
+
+def test_cli_prefetches_tei_but_processes_in_order_on_main_thread(monkeypatch):
+    monkeypatch.setenv("PAPERSLICER_GROBID_WORKERS", "3")
+    # p0..p2 only get past the barrier if all three requests are in flight at
+    # once, and p0 then waits for p2 to finish, so completion is out of order.
+    barrier = threading.Barrier(3, timeout=5)
+    p2_done = threading.Event()
+
+    def p0():
+        barrier.wait()
+        assert p2_done.wait(timeout=5)
+
+    def p2():
+        barrier.wait()
+        p2_done.set()
+
+    client = _FakePrefetchClient({"p0.pdf": p0, "p1.pdf": barrier.wait, "p2.pdf": p2})
+    seen = []
+
+    def fake_process(p, cli, tei):
+        seen.append((p, tei, threading.current_thread() is threading.main_thread()))
+        return {"meta": {"source_path": p}}
+
+    paths = [f"p{i}.pdf" for i in range(7)]
+    out = [p for p, _ in project._iter_records(paths, client, fake_process)]
+
+    assert out == paths
+    assert [t for _, t, _ in seen] == [(f"<TEI>{p}</TEI>".encode(), None) for p in paths]
+    assert all(on_main for _, _, on_main in seen), "mapping/export must stay on the caller's thread"
+
+
+def test_cli_prefetch_stops_queueing_when_consumer_closes(monkeypatch):
+    monkeypatch.setenv("PAPERSLICER_GROBID_WORKERS", "2")
+    release = threading.Event()
+    paths = [f"p{i}.pdf" for i in range(50)]
+    # Every request after the first blocks, so both workers stay busy and the
+    # rest of the 2 x workers window is still queued when the consumer stops.
+    client = _FakePrefetchClient({p: (lambda: release.wait(timeout=5)) for p in paths[1:]})
+
+    gen = project._prefetch_tei(paths, client)
+    try:
+        assert next(gen)[0] == "p0.pdf"
+        gen.close()
+        assert set(client.calls) <= {"p0.pdf", "p1.pdf", "p2.pdf"}, "queued requests must be cancelled"
+    finally:
+        release.set()
+
+
+def test_cli_prefetch_failure_is_handed_over_not_retried(monkeypatch):
+    monkeypatch.setenv("PAPERSLICER_GROBID_WORKERS", "2")
+    calls = []
+    lock = threading.Lock()
+
+    class FailingClient:
+        def is_available(self):
+            return True
+
+        def process_fulltext(self, path, save_dir=None):
+            with lock:
+                calls.append(path)
+            if path == "bad.pdf":
+                raise RuntimeError("GROBID 500")
+            return b"<TEI/>", None
+
+    seen = {}
+    list(project._iter_records(["ok.pdf", "bad.pdf"], FailingClient(), lambda p, c, tei: seen.setdefault(p, tei)))
+
+    assert seen["ok.pdf"] == (b"<TEI/>", None)
+    assert isinstance(seen["bad.pdf"], RuntimeError)
+    assert sorted(calls) == ["bad.pdf", "ok.pdf"], "each PDF is sent to GROBID exactly once"
+
+
 @pytest.mark.skipif(
     not os.getenv("GROBID_URL"),
     reason="GROBID_URL not set, skipping integration test"
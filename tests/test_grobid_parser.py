@@ -85,3 +85,55 @@ def test_other_sections_capture_when_unmapped():
     rec = tei_to_record(tei, pdf_path="/p.pdf")
     assert "Novel Protocol" in rec.other_sections
     assert "unique protocol" in rec.other_sections["Novel Protocol"].lower()
+
+
+def test_figure_coords_resolved_from_facsimile_zone():
+    tei = ("""
+    <TEI xmlns=\"http://www.tei-c.org/ns/1.0\">
+      <teiHeader><fileDesc><titleStmt><title>T</title></titleStmt></fileDesc></teiHeader>
+      <facsimile>
+        <surface n=\"3\"><zone xml:id=\"z1\" ulx=\"10\" uly=\"20\" lrx=\"110\" lry=\"220\"/></surface>
+      </facsimile>
+      <text><body>
+        <figure facs=\"#z1\"><head>Figure 1</head><figDesc>Zone figure.</figDesc></figure>
+        <figure facs=\"#missing\"><head>Figure 2</head><figDesc>No zone.</figDesc></figure>
+        <figure facs=\"#z1 #z2\"><head>Figure 3</head><figDesc>Multi-zone.</figDesc></figure>
+      </body></text>
+    </TEI>
+    """).encode("utf-8")
+    rec = tei_to_record(tei, pdf_path="/p.pdf")
+    coords = {f["label"]: f["coords"] for f in rec.figures}
+    assert coords["Figure 1"] == "3,10.0,20.0,100.0,200.0"
+    assert coords["Figure 2"] is None
+    assert coords["Figure 3"] == "3,10.0,20.0,100.0,200.0"
+
+
+def test_tei_to_records_batch_matches_serial_mapping():
+    from paperslicer.grobid.batch import tei_to_records
+
+    items = [(_sample_tei(), f"/p{i}.pdf") for i in range(3)]
+    recs = tei_to_records(items, workers=2, chunksize=1)
+    assert [r.meta.source_path for r in recs] == ["/p0.pdf", "/p1.pdf", "/p2.pdf"]
+    assert recs[0].to_dict()["sections"] == tei_to_record(items[0][0], "/p0.pdf").to_dict()["sections"]
+    assert tei_to_records([], workers=4) == []
+
+
+def test_four_number_coords_take_nearest_preceding_page_break():
+    tei = ("""
+    <TEI xmlns=\"http://www.tei-c.org/ns/1.0\">
+      <teiHeader><fileDesc><titleStmt><title>T</title></titleStmt></fileDesc></teiHeader>
+      <text><body>
+        <figure><head>Figure 1</head><graphic coords=\"1,2,3,4\"/></figure>
+        <pb n=\"4\"/>
+        <div><head>Results</head><p>Text.</p><pb n=\"5\"/></div>
+        <figure><head>Figure 2</head><graphic coords=\"5,6,7,8\"/></figure>
+        <pb n=\"x\"/>
+        <table><head>Table 1</head><graphic coords=\"9,10,11,12\"/></table>
+      </body></text>
+    </TEI>
+    """).encode("utf-8")
+    rec = tei_to_record(tei, pdf_path="/p.pdf")
+    coords = {f["label"]: f["coords"] for f in rec.figures + rec.tables}
+    assert coords["Figure 1"] is None
+    assert coords["Figure 2"] == "5,5.0,6.0,7.0,8.0"
+    assert coords["Table 1"] is None
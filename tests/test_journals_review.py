@@ -0,0 +1,20 @@
+from paperslicer.journals import review
+from paperslicer.models import Meta, PaperRecord
+
+
+def test_apply_appends_method_sections_and_aggregates_discussion():
+    rec = PaperRecord(
+        meta=Meta(source_path="p.pdf", title="A systematic review"),
+        sections={"materials_and_methods": "Base methods."},
+        other_sections={
+            "Search Strategy": "We searched PubMed.",
+            "Study Selection": "Two reviewers screened.",
+            "Clinical Management": "Manage carefully.",
+        },
+    )
+    assert review.should_apply(rec)
+    review.apply(rec)
+    assert rec.sections["materials_and_methods"] == (
+        "Base methods.\n\nWe searched PubMed.\n\nTwo reviewers screened."
+    )
+    assert rec.sections["discussion"] == "Clinical Management\nManage carefully."
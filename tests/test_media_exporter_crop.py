@@ -1,7 +1,10 @@
+import os
 import sys
 import types
 from pathlib import Path
 
+import pytest
+
 from paperslicer.media import exporter as exp
 
 
@@ -81,3 +84,102 @@ def test_export_page_previews_writes_pngs(tmp_path, monkeypatch):
     for p in paths:
         assert Path(p).exists(), f"Preview file missing: {p}"
 
+
+
+def test_exporters_reuse_caller_opened_document(tmp_path, monkeypatch):
+    fake = make_fake_fitz(tmp_path)
+    doc = fake.open("shared.pdf")
+    closed = []
+    doc.close = lambda: closed.append(True)
+
+    def no_open(path):
+        raise AssertionError("exporter should reuse the provided document")
+
+    fake.open = no_open
+    monkeypatch.setitem(sys.modules, 'fitz', fake)
+
+    pdf_path = str(tmp_path / "fake.pdf")
+    out = exp.export_page_previews(pdf_path, media_root=str(tmp_path / "media"), dpi=72, max_pages=1, doc=doc)
+    assert len(out) == 1
+    assert exp.export_embedded_images(pdf_path, media_root=str(tmp_path / "media"), doc=doc) == []
+    assert closed == [], "caller-owned document must not be closed by exporters"
+
+
+def test_page_previews_reuse_manifest_for_unchanged_pdf(tmp_path, monkeypatch):
+    fake = make_fake_fitz(tmp_path)
+    monkeypatch.setitem(sys.modules, 'fitz', fake)
+    pdf = tmp_path / "paper.pdf"
+    pdf.write_bytes(b"%PDF-1.4")
+    media = str(tmp_path / "media")
+
+    first = exp.export_page_previews(str(pdf), media_root=media, dpi=72, max_pages=1)
+    assert len(first) == 1
+
+    def no_open(path):
+        raise AssertionError("unchanged PDF should be served from the manifest")
+
+    fake.open = no_open
+    assert exp.export_page_previews(str(pdf), media_root=media, dpi=72, max_pages=1) == first
+
+
+def test_parse_coord_chunks_handles_mixed_separators():
+    chunks = exp._parse_coord_chunks("1,10.5,20,30,40;2 1 2 3 4  3,1")
+    assert chunks == [(1, 10.5, 20.0, 30.0, 40.0), (2, 1.0, 2.0, 3.0, 4.0)]
+    assert exp._parse_coord_chunks("") == []
+
+
+def test_keyword_pages_reuse_cached_page_text(tmp_path, monkeypatch):
+    fake = make_fake_fitz(tmp_path)
+    calls = []
+    doc = fake.open("kw.pdf")
+    for i, page in enumerate(doc._pages):
+        page.get_text = lambda mode="text", i=i: calls.append(i) or ("See Figure 1" if i == 1 else "Body text")
+    monkeypatch.setitem(sys.modules, 'fitz', fake)
+    monkeypatch.setattr(exp, "_PAGE_TEXT_CACHE", exp.OrderedDict())
+    pdf = tmp_path / "kw.pdf"
+    pdf.write_bytes(b"%PDF-1.4")
+    media = str(tmp_path / "media")
+
+    first = exp.export_pages_with_keywords(str(pdf), ["figure"], media_root=media, doc=doc)
+    second = exp.export_pages_with_keywords(str(pdf), ["table", "figure"], media_root=media, doc=doc)
+    assert [r["label"] for r in first] == [r["label"] for r in second] == ["Page 2"]
+    assert calls == [0, 1, 2], "page text should be extracted once per page"
+
+
+def test_reusable_export_files_follow_pdf_size_and_mtime(tmp_path, monkeypatch):
+    fake = make_fake_fitz(tmp_path)
+    monkeypatch.setitem(sys.modules, 'fitz', fake)
+    pdf = tmp_path / "keep.pdf"
+    pdf.write_bytes(b"%PDF-1.4")
+    media = tmp_path / "media"
+
+    out = exp.export_page_previews(str(pdf), media_root=str(media), dpi=72, max_pages=1)
+    out_dir = media / exp._safe_stem(str(pdf))
+    keep = exp.reusable_export_files(str(pdf), str(out_dir))
+    assert os.path.abspath(out[0]["path"]) in keep
+    assert os.path.abspath(out_dir / ".previews.manifest.json") in keep
+
+    st = os.stat(pdf)
+    os.utime(pdf, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert exp.reusable_export_files(str(pdf), str(out_dir)) == set()
+
+
+def test_embedded_cmyk_image_is_written_as_rgb_png(tmp_path, monkeypatch):
+    # Other tests here leave a fake fitz in sys.modules; load the real one
+    monkeypatch.delitem(sys.modules, 'fitz', raising=False)
+    fitz = pytest.importorskip("fitz")
+    # Four-channel CMYK without alpha: pix.n == 4, which the old n > 4 check missed
+    cmyk = fitz.Pixmap(fitz.csCMYK, fitz.IRect(0, 0, 8, 8), False)
+    cmyk.clear_with(0)
+    src = fitz.open()
+    src.new_page().insert_image(fitz.Rect(10, 10, 50, 50), pixmap=cmyk)
+    pdf = tmp_path / "cmyk.pdf"
+    src.save(str(pdf))
+    src.close()
+
+    out = exp.export_embedded_images(str(pdf), media_root=str(tmp_path / "media"))
+
+    assert len(out) == 1
+    assert out[0]["path"].endswith(".png") and os.path.isfile(out[0]["path"])
+    written = fitz.Pixmap(out[0]["path"])
+    assert written.colorspace.n == 3 and written.n == 3